@@ -0,0 +1,124 @@
+"""
+Account State Module
+Balance, equity and margin kept in memory, refreshed in the background
+"""
+import threading
+import time
+from collections import namedtuple
+
+
+AccountSnapshot = namedtuple('AccountSnapshot', [
+    'balance',
+    'equity',
+    'margin',
+    'margin_free',
+    'profit',
+    'leverage',
+    'updated',  # monotonic time of the last broker refresh
+])
+
+
+class AccountState:
+    """
+    Account figures served from memory instead of account_info per trade
+    - a daemon thread reloads them every refresh_interval seconds
+    - on_fill/on_close adjust them optimistically right after an order and
+      wake the refresher, so the next broker read reconciles them
+    - reads never block on the broker; before the first refresh they
+      return None and callers fall back to account_info
+    """
+
+    def __init__(self, account_info, refresh_interval=5.0):
+        """account_info: callable() -> MT5 account_info result (or None)"""
+        self.account_info = account_info
+        self.refresh_interval = refresh_interval
+        self.state = None
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Load once, then keep refreshing in the background"""
+        self.refresh()
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name="account-state", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def refresh(self):
+        """Reload from the broker now; keeps the old state on failure"""
+        info = self.account_info()
+        if not info:
+            return self.state
+        with self.lock:
+            self.state = AccountSnapshot(
+                balance=info.balance,
+                equity=info.equity,
+                margin=info.margin,
+                margin_free=info.margin_free,
+                profit=info.profit,
+                leverage=info.leverage or 1,
+                updated=time.monotonic(),
+            )
+            return self.state
+
+    def snapshot(self):
+        """Latest AccountSnapshot (None before the first refresh)"""
+        return self.state
+
+    @property
+    def balance(self):
+        state = self.state
+        return state.balance if state else None
+
+    @property
+    def equity(self):
+        state = self.state
+        return state.equity if state else None
+
+    @property
+    def margin_free(self):
+        state = self.state
+        return state.margin_free if state else None
+
+    def on_fill(self, volume, price, contract_size):
+        """New position: reserve its margin until the next refresh"""
+        with self.lock:
+            state = self.state
+            if state is None:
+                return
+            margin = volume * contract_size * price / state.leverage
+            self.state = state._replace(margin=state.margin + margin,
+                                        margin_free=state.margin_free - margin)
+        self._wake.set()
+
+    def on_close(self, volume, price_open, contract_size, profit):
+        """Closed position: book its profit and release its margin"""
+        with self.lock:
+            state = self.state
+            if state is None:
+                return
+            margin = min(volume * contract_size * price_open / state.leverage, state.margin)
+            self.state = state._replace(balance=state.balance + profit,
+                                        margin=state.margin - margin,
+                                        margin_free=state.margin_free + margin,
+                                        profit=state.profit - profit)
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️  Account refresh failed: {e}")
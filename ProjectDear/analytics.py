@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Trade Analytics
+Equity curve, drawdown, profit factor, Sharpe, expectancy and per-hour
+win rate from trades.db, computed with NumPy in fixed-size chunks
+
+Usage:
+    python analytics.py                          # trades.db, all closed trades
+    python analytics.py backtest.db --symbol XAUUSD --start 2024-01-01 --end 2024-07-01
+"""
+import argparse
+import itertools
+import json
+import math
+import sqlite3
+import time
+
+import numpy as np
+
+from logger import TradeLogger, to_ts
+
+
+TRADE_DTYPE = np.dtype([('ts', '<i8'), ('profit', '<f8')])
+DAY_MS = 86_400_000
+HOUR_MS = 3_600_000
+OFFSET_STEP_MS = 900_000  # UTC offsets (and DST changes) fall on quarter hours
+
+
+class TradeAnalytics:
+    """
+    Read-only view of closed trades (status WIN/LOSS) in a TradeLogger
+    database. Rows come off the cursor straight into NumPy arrays
+    (np.fromiter, chunk_size rows at a time), so memory stays bounded by
+    the chunk no matter how many trades the table holds; only per-day
+    totals are kept across chunks.
+    Filters: start <= timestamp < end (datetime or ISO string), symbol,
+    account. Times are bucketed in local time, like the logged timestamps.
+    """
+
+    def __init__(self, source="trades.db", chunk_size=1_000_000):
+        """source: TradeLogger (pending writes are flushed) or a database path"""
+        if isinstance(source, TradeLogger):
+            source.flush()
+            source = source.db_path
+        self.db_path = source
+        self.chunk_size = chunk_size
+        # Own read-only connection: WAL lets it read while the logger writes
+        self.conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True, check_same_thread=False)
+
+    def close(self):
+        self.conn.close()
+
+    def _select(self, columns, start, end, symbol, account):
+        # Unary + keeps the planner off idx_trades_status, so a ts index drives
+        # the range scan and ORDER BY ts needs no sort
+        conditions = ["+status IN ('WIN', 'LOSS')", "profit IS NOT NULL", "ts IS NOT NULL"]
+        params = []
+        if start is not None:
+            conditions.append("ts >= ?")
+            params.append(to_ts(start))
+        if end is not None:
+            conditions.append("ts < ?")
+            params.append(to_ts(end))
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if account is not None:
+            conditions.append("account = ?")
+            params.append(account)
+        sql = f"SELECT {columns} FROM trades WHERE {' AND '.join(conditions)}"
+        return sql, params
+
+    @staticmethod
+    def local_ms(ts):
+        """
+        Epoch-ms array -> local wall-clock ms, with the UTC offset in force
+        at each trade, so days and hours stay right across DST changes
+        (one localtime() call per quarter-hour run of sorted ts)
+        """
+        if len(ts) == 0:
+            return ts
+        steps = ts // OFFSET_STEP_MS
+        starts = np.flatnonzero(np.r_[True, steps[1:] != steps[:-1]])
+        offsets = np.array([time.localtime(int(step) * OFFSET_STEP_MS // 1000).tm_gmtoff
+                            for step in steps[starts]], dtype=np.int64) * 1000
+        return ts + np.repeat(offsets, np.diff(np.r_[starts, len(ts)]))
+
+    def count(self, start=None, end=None, symbol=None, account=None):
+        sql, params = self._select("COUNT(*)", start, end, symbol, account)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def iter_chunks(self, start=None, end=None, symbol=None, account=None):
+        """Yield TRADE_DTYPE arrays (ts, profit) in time order, chunk_size rows each"""
+        sql, params = self._select("ts, profit", start, end, symbol, account)
+        cursor = self.conn.execute(sql + " ORDER BY ts", params)
+        while True:
+            chunk = np.fromiter(itertools.islice(cursor, self.chunk_size), dtype=TRADE_DTYPE)
+            if len(chunk) == 0:
+                return
+            yield chunk
+
+    def load(self, start=None, end=None, symbol=None, account=None):
+        """All matching trades as one TRADE_DTYPE array (preallocated, filled per chunk)"""
+        trades = np.empty(self.count(start, end, symbol, account), dtype=TRADE_DTYPE)
+        filled = 0
+        for chunk in self.iter_chunks(start, end, symbol, account):
+            n = min(len(chunk), len(trades) - filled)  # rows added since count()
+            trades[filled:filled + n] = chunk[:n]
+            filled += n
+        return trades[:filled]
+
+    def equity_curve(self, initial_balance=0.0, start=None, end=None, symbol=None, account=None):
+        """Returns: (ts epoch-ms array, equity after each trade)"""
+        trades = self.load(start, end, symbol, account)
+        return trades['ts'], initial_balance + np.cumsum(trades['profit'])
+
+    def metrics(self, initial_balance=0.0, start=None, end=None, symbol=None, account=None,
+                periods_per_year=252):
+        """
+        Streaming metrics over all matching trades
+        Sharpe is annualized from daily returns (P/L of each trading day /
+        equity at its start; days without trades are skipped).
+        """
+        n = wins = 0
+        gross_win = gross_loss = 0.0
+        equity = peak = float(initial_balance)
+        max_dd = max_dd_pct = 0.0
+        hour_trades = np.zeros(24, dtype=np.int64)
+        hour_wins = np.zeros(24, dtype=np.int64)
+        day_keys = []
+        day_sums = []
+
+        for chunk in self.iter_chunks(start, end, symbol, account):
+            profit = chunk['profit']
+            won = profit > 0
+            n += len(chunk)
+            wins += int(np.count_nonzero(won))
+            gross_win += float(profit[won].sum())
+            gross_loss -= float(profit[~won].sum())
+
+            # Equity and drawdown, carrying the last equity/peak across chunks
+            curve = equity + np.cumsum(profit)
+            peaks = np.maximum.accumulate(np.maximum(curve, peak))
+            drawdown = peaks - curve
+            max_dd = max(max_dd, float(drawdown.max()))
+            positive = peaks > 0
+            if positive.any():
+                max_dd_pct = max(max_dd_pct, float((drawdown[positive] / peaks[positive]).max()))
+            equity, peak = float(curve[-1]), float(peaks[-1])
+
+            local = self.local_ms(chunk['ts'])
+            hours = (local // HOUR_MS) % 24
+            hour_trades += np.bincount(hours, minlength=24)
+            hour_wins += np.bincount(hours[won], minlength=24)
+
+            # Per-day P/L (ts sorted, so each day is one run)
+            days = local // DAY_MS
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            day_keys.append(days[starts])
+            day_sums.append(np.add.reduceat(profit, starts))
+
+        if n == 0:
+            return None
+
+        sharpe = float('nan')
+        if day_keys:
+            # A day split across two chunks shows up twice; merge it
+            keys, inverse = np.unique(np.concatenate(day_keys), return_inverse=True)
+            daily = np.bincount(inverse, weights=np.concatenate(day_sums))
+            day_start = initial_balance + np.cumsum(daily) - daily
+            valid = day_start > 0
+            returns = daily[valid] / day_start[valid]
+            if len(returns) > 1 and returns.std(ddof=1) > 0:
+                sharpe = float(returns.mean() / returns.std(ddof=1) * math.sqrt(periods_per_year))
+
+        losses = n - wins
+        with np.errstate(invalid='ignore', divide='ignore'):
+            hourly_win_rate = np.where(hour_trades > 0, hour_wins / hour_trades, np.nan)
+
+        return {
+            'trades': n,
+            'wins': wins,
+            'losses': losses,
+            'win_rate': wins / n,
+            'total_profit': gross_win - gross_loss,
+            'profit_factor': gross_win / gross_loss if gross_loss else (float('inf') if gross_win else 0.0),
+            'expectancy': (gross_win - gross_loss) / n,
+            'avg_win': gross_win / wins if wins else 0.0,
+            'avg_loss': -gross_loss / losses if losses else 0.0,
+            'final_equity': equity,
+            'max_drawdown': max_dd,
+            'max_drawdown_pct': max_dd_pct,
+            'sharpe': sharpe,
+            'trading_days': int(len(keys)),
+            'hourly_trades': hour_trades,
+            'hourly_win_rate': hourly_win_rate,
+        }
+
+
+def print_report(metrics):
+    """Print analytics summary"""
+    print("\n" + "="*50)
+    print("📈 TRADE ANALYTICS")
+    print("="*50)
+    if not metrics:
+        print("No closed trades")
+        print("="*50 + "\n")
+        return
+
+    print(f"Trades: {metrics['trades']} over {metrics['trading_days']} days")
+    print(f"Wins: {metrics['wins']} | Losses: {metrics['losses']} | Win rate: {metrics['win_rate']*100:.1f}%")
+    print(f"Total P/L: ${metrics['total_profit']:.2f} | Final equity: ${metrics['final_equity']:.2f}")
+    print(f"Profit factor: {metrics['profit_factor']:.2f} | Expectancy: ${metrics['expectancy']:.2f}/trade")
+    print(f"Avg win: ${metrics['avg_win']:.2f} | Avg loss: ${metrics['avg_loss']:.2f}")
+    print(f"Max drawdown: ${metrics['max_drawdown']:.2f} ({metrics['max_drawdown_pct']*100:.1f}%)")
+    print(f"Sharpe (daily, annualized): {metrics['sharpe']:.2f}")
+    print("Win rate by hour:")
+    for hour in range(24):
+        if metrics['hourly_trades'][hour]:
+            print(f"   {hour:02d}:00  {metrics['hourly_win_rate'][hour]*100:5.1f}%  "
+                  f"({metrics['hourly_trades'][hour]} trades)")
+    print("="*50 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics over logged trades")
+    parser.add_argument('db', nargs='?', default="trades.db")
+    parser.add_argument('--symbol')
+    parser.add_argument('--account')
+    parser.add_argument('--start', help="YYYY-MM-DD[THH:MM:SS], inclusive")
+    parser.add_argument('--end', help="YYYY-MM-DD[THH:MM:SS], exclusive")
+    parser.add_argument('--balance', type=float, help="initial balance (default: config.json)")
+    args = parser.parse_args()
+
+    balance = args.balance
+    if balance is None:
+        try:
+            with open("config.json", 'r') as f:
+                balance = json.load(f)['account']['initial_balance']
+        except (OSError, KeyError):
+            balance = 0.0
+
+    analytics = TradeAnalytics(args.db)
+    print_report(analytics.metrics(balance, args.start, args.end, args.symbol, args.account))
+    analytics.close()
+
+
+if __name__ == "__main__":
+    main()
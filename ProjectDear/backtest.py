@@ -0,0 +1,270 @@
+"""
+Backtest Module
+Replay historical OHLCV through the scalping strategy offline
+"""
+import json
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from indicators import generate_signals
+from logger import TradeLogger
+from symbol_settings import pip_value
+
+
+def _epoch_seconds(times):
+    """Bar times (datetime64 or MT5 epoch seconds) as int64 seconds"""
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return times.astype('datetime64[s]').astype(np.int64)
+    if times.dtype == object:
+        return pd.to_datetime(times).values.astype('datetime64[s]').astype(np.int64)
+    return times.astype(np.int64)
+
+
+def _isoformat(seconds):
+    return datetime.fromtimestamp(int(seconds), tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class Backtester:
+    """
+    Offline version of GoldScalpingBot
+    Same rules as bot.py: one position at a time, fixed SL/TP in pips,
+    RSI emergency exit, trading hours, max trades per day and max
+    consecutive losses (both reset at each new day). Stops when the
+    balance is gone. Signals come from generate_signals; exits are found
+    with array scans per trade, so the Python loop runs once per trade
+    instead of once per bar.
+    """
+
+    def __init__(self, config, logger=None, point=0.01, contract_size=100,
+                 volume_step=0.01, volume_min=0.01, volume_max=1.0):
+        self.config = config
+        self.logger = logger
+        self.point = point
+        self.contract_size = contract_size
+        self.volume_step = volume_step
+        self.volume_min = volume_min
+        self.volume_max = volume_max
+
+    def run(self, data, initial_balance=None, start=0):
+        """
+        Run the strategy over historical bars
+        data: DataFrame or MT5 rates array with time/open/high/low/close
+        (and optionally tick_volume). Bars before `start` only warm up the
+        indicators. Signals are taken at bar close and
+        filled at the next bar's open; when SL and TP are both inside one
+        bar the SL is assumed to hit first.
+        Returns: dict with trades, daily stats and totals
+        """
+        strategy = self.config['strategy']
+        indicators = self.config['indicators']
+        if initial_balance is None:
+            initial_balance = self.config['account']['initial_balance']
+
+        columns = ['open', 'high', 'low', 'close']
+        if 'tick_volume' in _field_names(data):
+            columns.append('tick_volume')
+        frame = pd.DataFrame({name: np.asarray(data[name], dtype=float) for name in columns})
+        frame = generate_signals(frame, self.config)
+
+        times = _epoch_seconds(data['time'])
+        opens = frame['open'].to_numpy()
+        highs = frame['high'].to_numpy()
+        lows = frame['low'].to_numpy()
+        closes = frame['close'].to_numpy()
+        rsi = frame['rsi'].to_numpy()
+        signals = frame['signal'].to_numpy()
+        days = times // 86400
+        hours = (times // 3600) % 24
+        bars = len(closes)
+
+        # Trading hours filter (handles sessions crossing midnight)
+        start_hour = strategy['trading_hours']['start']
+        end_hour = strategy['trading_hours']['end']
+        if start_hour < end_hour:
+            in_hours = (hours >= start_hour) & (hours < end_hour)
+        else:
+            in_hours = (hours >= start_hour) | (hours < end_hour)
+
+        # Entry candidates: signal on bar i, filled at bar i + 1
+        candidates = np.flatnonzero((signals != 0) & in_hours)
+        candidates = candidates[(candidates >= start) & (candidates < bars - 1)]
+
+        sl_distance = strategy['stop_loss_pips'] * self.point * 10  # 1 pip = 10 points
+        tp_distance = strategy['take_profit_pips'] * self.point * 10
+        max_trades = strategy['max_trades_per_day']
+        max_losses = strategy['max_consecutive_losses']
+
+        balance = initial_balance
+        trades = []
+        daily = {}
+        current_day = None
+        trades_today = 0
+        consecutive_losses = 0
+        next_bar = 0
+
+        while balance > 0:
+            k = np.searchsorted(candidates, next_bar)
+            if k >= len(candidates):
+                break
+            i = candidates[k]
+
+            if days[i] != current_day:
+                current_day = days[i]
+                trades_today = 0
+                consecutive_losses = 0
+
+            if trades_today >= max_trades or consecutive_losses >= max_losses:
+                # Stopped for today: jump to the first bar of the next day
+                next_bar = np.searchsorted(days, current_day + 1)
+                continue
+
+            order_type = 'BUY' if signals[i] == 1 else 'SELL'
+            entry_bar = i + 1
+            entry_price = opens[entry_bar]
+            if order_type == 'BUY':
+                sl = entry_price - sl_distance
+                tp = entry_price + tp_distance
+            else:
+                sl = entry_price + sl_distance
+                tp = entry_price - tp_distance
+
+            exit_bar, exit_price, reason = self._find_exit(
+                order_type, entry_bar, sl, tp, highs, lows, closes, rsi, indicators)
+
+            lot_size = self._lot_size(balance)
+            direction = 1 if order_type == 'BUY' else -1
+            profit = (exit_price - entry_price) * direction * lot_size * self.contract_size
+            balance += profit
+            trades_today += 1
+            if profit > 0:
+                consecutive_losses = 0
+            else:
+                consecutive_losses += 1
+
+            status = 'WIN' if profit > 0 else 'LOSS'
+            trades.append({
+                'timestamp': _isoformat(times[exit_bar]),
+                'symbol': strategy['symbol'],
+                'type': order_type,
+                'lot_size': lot_size,
+                'entry_price': float(entry_price),
+                'sl': float(sl),
+                'tp': float(tp),
+                'exit_price': float(exit_price),
+                'profit': float(profit),
+                'status': status,
+                'comment': f"{reason} | opened {_isoformat(times[entry_bar])}"
+            })
+
+            date = _isoformat(times[exit_bar])[:10]
+            stats = daily.setdefault(date, {'total_trades': 0, 'wins': 0, 'losses': 0,
+                                            'total_profit': 0.0, 'balance': balance})
+            stats['total_trades'] += 1
+            stats['wins' if status == 'WIN' else 'losses'] += 1
+            stats['total_profit'] += float(profit)
+            stats['balance'] = float(balance)
+
+            next_bar = exit_bar + 1
+
+        if self.logger:
+            self.logger.log_trades(trades)
+            for date, stats in daily.items():
+                self.logger.update_daily_stats(date, {'balance': stats['balance']})
+
+        wins = sum(1 for t in trades if t['status'] == 'WIN')
+        return {
+            'trades': trades,
+            'daily_stats': daily,
+            'initial_balance': initial_balance,
+            'final_balance': float(balance),
+            'total_trades': len(trades),
+            'wins': wins,
+            'losses': len(trades) - wins,
+            'total_profit': float(balance - initial_balance),
+        }
+
+    def _find_exit(self, order_type, entry_bar, sl, tp, highs, lows, closes, rsi, indicators):
+        """
+        First bar at or after entry_bar where the position is closed
+        Scans forward in growing chunks so short trades stay cheap.
+        Returns: (exit_bar, exit_price, reason)
+        """
+        bars = len(closes)
+        start = entry_bar
+        chunk = 64
+        while start < bars:
+            end = min(bars, start + chunk)
+            if order_type == 'BUY':
+                sl_hit = lows[start:end] <= sl
+                tp_hit = highs[start:end] >= tp
+                rsi_hit = rsi[start:end] > indicators['rsi_overbought']
+            else:
+                sl_hit = highs[start:end] >= sl
+                tp_hit = lows[start:end] <= tp
+                rsi_hit = rsi[start:end] < indicators['rsi_oversold']
+
+            hit = sl_hit | tp_hit | rsi_hit
+            if hit.any():
+                offset = int(np.argmax(hit))
+                bar = start + offset
+                if sl_hit[offset]:
+                    return bar, sl, 'SL'
+                if tp_hit[offset]:
+                    return bar, tp, 'TP'
+                return bar, closes[bar], 'EMERGENCY_EXIT'
+
+            start = end
+            chunk *= 2
+
+        return bars - 1, closes[-1], 'END_OF_DATA'
+
+    def _lot_size(self, balance):
+        """Same sizing as MT5Broker.calculate_lot_size"""
+        strategy = self.config['strategy']
+        risk_amount = balance * (strategy['risk_percent'] / 100)
+        lot_size = (risk_amount / strategy['stop_loss_pips']) / pip_value(self.config, strategy['symbol'])
+        lot_size = round(lot_size / self.volume_step) * self.volume_step
+        return round(max(self.volume_min, min(lot_size, self.volume_max)), 2)
+
+
+def _field_names(data):
+    if isinstance(data, dict):
+        return list(data)
+    names = getattr(getattr(data, 'dtype', None), 'names', None)
+    return names if names is not None else list(data.columns)
+
+
+def print_results(results):
+    """Print backtest summary"""
+    total = results['total_trades']
+    wins = results['wins']
+
+    print("\n" + "="*50)
+    print("🧪 BACKTEST SUMMARY")
+    print("="*50)
+    print(f"Trades: {total}")
+    print(f"Wins: {wins} | Losses: {results['losses']}")
+    print(f"Win rate: {(wins/total*100):.1f}%" if total > 0 else "N/A")
+    print(f"Total P/L: ${results['total_profit']:.2f}")
+    print(f"Balance: ${results['initial_balance']:.2f} -> ${results['final_balance']:.2f}")
+    print("="*50 + "\n")
+
+
+if __name__ == "__main__":
+    # Usage: python backtest.py history.csv [backtest.db]
+    if len(sys.argv) < 2:
+        print("Usage: python backtest.py <ohlcv.csv> [db_path]")
+        sys.exit(1)
+
+    with open("config.json", 'r') as f:
+        config = json.load(f)
+
+    history = pd.read_csv(sys.argv[1])
+    logger = TradeLogger(db_path=sys.argv[2]) if len(sys.argv) > 2 else None
+
+    results = Backtester(config, logger=logger).run(history)
+    print_results(results)
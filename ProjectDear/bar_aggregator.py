@@ -0,0 +1,185 @@
+"""
+Bar Aggregator Module
+Build M1 ... D1 bars from one tick stream into fixed-size ring buffers
+"""
+import numpy as np
+
+
+TIMEFRAME_SECONDS = {
+    'M1': 60,
+    'M5': 300,
+    'M15': 900,
+    'M30': 1800,
+    'H1': 3600,
+    'H4': 14400,
+    'D1': 86400,
+}
+
+# Same layout as MT5 copy_rates_* arrays
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+
+class BarRing:
+    """Fixed-capacity ring of bars; the newest slot is the forming bar"""
+
+    def __init__(self, seconds, capacity):
+        self.seconds = seconds
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=RATES_DTYPE)
+        self.head = -1  # slot of the newest bar
+        self.count = 0
+
+    def current_time(self):
+        return int(self.buffer['time'][self.head]) if self.count else None
+
+    def push(self, bar_time, open_, high, low, close, ticks, volume):
+        """Start a new bar (the previous one is now closed)"""
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.buffer[self.head] = (bar_time, open_, high, low, close, ticks, 0, volume)
+
+    def merge(self, high, low, close, ticks, volume):
+        """Fold ticks into the forming bar"""
+        buf, h = self.buffer, self.head
+        if high > buf['high'][h]:
+            buf['high'][h] = high
+        if low < buf['low'][h]:
+            buf['low'][h] = low
+        buf['close'][h] = close
+        buf['tick_volume'][h] += ticks
+        buf['real_volume'][h] += volume
+
+    def bars(self, n=None):
+        """Last n bars, oldest first (copy; forming bar last)"""
+        n = self.count if n is None else min(n, self.count)
+        slots = (self.head - np.arange(n - 1, -1, -1)) % self.capacity
+        return self.buffer[slots]
+
+
+class TickBarAggregator:
+    """
+    Incremental bars for every timeframe from a single tick stream
+    Bars use the bid price and count ticks as tick_volume, like MT5.
+    A tick whose time falls in a new bar period closes the previous bar;
+    callbacks registered with on_bar_close then fire for that timeframe.
+    """
+
+    def __init__(self, timeframes=None, capacity=1000):
+        timeframes = timeframes or list(TIMEFRAME_SECONDS)
+        self.rings = {tf: BarRing(TIMEFRAME_SECONDS[tf], capacity) for tf in timeframes}
+        self.callbacks = []
+
+    def on_bar_close(self, callback):
+        """Register callback(timeframe, closed_bar), called once per closed bar"""
+        self.callbacks.append(callback)
+
+    def seed(self, timeframe, rates):
+        """Preload history (e.g. from copy_rates_from_pos) into one timeframe"""
+        ring = self.rings[timeframe]
+        has_real_volume = 'real_volume' in rates.dtype.names
+        for bar in rates[-ring.capacity:]:
+            ring.push(int(bar['time']), bar['open'], bar['high'], bar['low'], bar['close'],
+                      int(bar['tick_volume']), int(bar['real_volume']) if has_real_volume else 0)
+
+    def on_tick(self, tick):
+        """
+        Apply one tick (symbol_info_tick result or a copy_ticks_from row)
+        Returns: list of timeframes whose bar closed on this tick
+        """
+        seconds = int(_tick_field(tick, 'time'))
+        price = float(_tick_field(tick, 'bid'))
+        volume = int(_tick_field(tick, 'volume') or 0)
+
+        closed = {}
+        for tf, ring in self.rings.items():
+            bar_time = seconds - seconds % ring.seconds
+            current = ring.current_time()
+            if current is None or bar_time > current:
+                if current is not None:
+                    closed[tf] = 1
+                ring.push(bar_time, price, price, price, price, 1, volume)
+            elif bar_time == current:
+                ring.merge(price, price, price, 1, volume)
+            # Older ticks (out of order) are ignored
+
+        self._fire(closed)
+        return list(closed)
+
+    def on_ticks(self, ticks):
+        """
+        Apply a batch of ticks (copy_ticks_from array), vectorized per timeframe
+        Returns: list of timeframes that closed at least one bar
+        """
+        if ticks is None or len(ticks) == 0:
+            return []
+
+        times = ticks['time'].astype(np.int64)
+        prices = ticks['bid'].astype(np.float64)
+        volumes = ticks['volume'].astype(np.uint64) if 'volume' in ticks.dtype.names else np.zeros(len(ticks), np.uint64)
+
+        closed = {}
+        for tf, ring in self.rings.items():
+            current = ring.current_time()
+            keys = times - times % ring.seconds
+            if current is not None:
+                keep = keys >= current
+                keys, tf_prices, tf_volumes = keys[keep], prices[keep], volumes[keep]
+            else:
+                tf_prices, tf_volumes = prices, volumes
+            if len(keys) == 0:
+                continue
+
+            # One group per bar period
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            ends = np.r_[starts[1:], len(keys)] - 1
+            highs = np.maximum.reduceat(tf_prices, starts)
+            lows = np.minimum.reduceat(tf_prices, starts)
+            counts = np.diff(np.r_[starts, len(keys)])
+            vols = np.add.reduceat(tf_volumes, starts)
+
+            first = 0
+            if current is not None and keys[0] == current:
+                ring.merge(highs[0], lows[0], tf_prices[ends[0]], int(counts[0]), int(vols[0]))
+                first = 1
+            # Every new group closes the bar before it
+            opened = len(starts) - first
+            if opened and (current is not None or opened > 1):
+                closed[tf] = opened if current is not None else opened - 1
+            for g in range(first, len(starts)):
+                ring.push(int(keys[starts[g]]), tf_prices[starts[g]], highs[g], lows[g],
+                          tf_prices[ends[g]], int(counts[g]), int(vols[g]))
+
+        self._fire(closed)
+        return list(closed)
+
+    def bars(self, timeframe, n=None):
+        """Last n bars of a timeframe as an MT5-style rates array"""
+        return self.rings[timeframe].bars(n)
+
+    def _fire(self, closed):
+        """closed: {timeframe: number of bars closed}, oldest fired first"""
+        if not self.callbacks:
+            return
+        for tf, n in closed.items():
+            ring = self.rings[tf]
+            n = min(n, ring.count - 1)
+            for back in range(n, 0, -1):
+                closed_bar = ring.buffer[(ring.head - back) % ring.capacity].copy()
+                for callback in self.callbacks:
+                    callback(tf, closed_bar)
+
+
+def _tick_field(tick, name):
+    """Field of a symbol_info_tick namedtuple or a copy_ticks_from row"""
+    if hasattr(tick, name):
+        return getattr(tick, name)
+    return tick[name]
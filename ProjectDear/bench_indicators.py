@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Indicator Benchmarks
+Time, peak memory and allocations of the indicators module on synthetic
+OHLCV, compared against a stored baseline
+
+Usage:
+    python bench_indicators.py                  # run and compare with baseline
+    python bench_indicators.py --save           # run and store as new baseline
+    python bench_indicators.py --max-bars 100000 --threshold 0.25
+Timings are medians over at least MIN_TIME seconds of runs, gated as a
+ratio to a calibration workload timed alongside; cases faster than
+--min-ms are reported but not gated (too close to timer noise) and
+cases under 10x --min-ms get twice the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from indicators import (
+    calculate_rsi,
+    calculate_bollinger_bands,
+    calculate_atr,
+    calculate_volume_spike,
+    generate_signals,
+)
+
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+BASELINE_FILE = "bench_baseline.json"
+MIN_TIME = 0.2     # seconds of timed runs per case
+MIN_REPEATS = 3
+MAX_REPEATS = 1000
+CONFIG = {
+    'indicators': {
+        'rsi_period': 14,
+        'rsi_oversold': 30,
+        'rsi_overbought': 70,
+        'bb_period': 20,
+        'bb_std': 2,
+        'atr_period': 14,
+        'atr_threshold': 1.5,
+        'volume_ma_period': 20,
+    }
+}
+
+BENCHMARKS = {
+    'calculate_rsi': lambda df: calculate_rsi(df, 14),
+    'calculate_bollinger_bands': lambda df: calculate_bollinger_bands(df, 20, 2),
+    'calculate_atr': lambda df: calculate_atr(df, 14),
+    'calculate_volume_spike': lambda df: calculate_volume_spike(df, 20),
+    'generate_signals': lambda df: generate_signals(df, CONFIG),
+}
+
+
+def synthetic_ohlcv(bars, seed=42):
+    """Random-walk gold-like M1 bars (same data for the same seed)"""
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 0.5, bars))
+    open_ = np.empty(bars)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    high = np.maximum(open_, close) + rng.random(bars)
+    low = np.minimum(open_, close) - rng.random(bars)
+    return pd.DataFrame({
+        'time': pd.date_range('2020-01-01', periods=bars, freq='1min'),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'tick_volume': rng.integers(50, 500, bars),
+    })
+
+
+_CALIBRATION = pd.Series(np.random.default_rng(0).normal(size=100_000))
+
+
+def calibration():
+    """Fixed reference workload timed next to every run (tracks machine speed)"""
+    return _CALIBRATION.rolling(20).mean()
+
+
+def measure(func, data, min_time=MIN_TIME, min_repeats=MIN_REPEATS, max_repeats=MAX_REPEATS):
+    """
+    Median wall time of repeated runs (fresh copy each run, not timed),
+    run until at least min_time seconds and min_repeats runs are timed.
+    Each run is followed by the calibration workload; 'relative' is the
+    ratio of the two medians, which cancels most of the drift of a shared
+    or throttled CPU. Then one traced run for peak memory and allocated
+    blocks.
+    """
+    times = []
+    reference = []
+    spent = 0.0
+    while len(times) < max_repeats and (len(times) < min_repeats or spent < min_time):
+        df = data.copy()
+        start = time.perf_counter()
+        func(df)
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+
+        start = time.perf_counter()
+        calibration()
+        reference.append(time.perf_counter() - start)
+
+    df = data.copy()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    seconds = float(np.median(times))
+    return {
+        'seconds': seconds,
+        'relative': seconds / float(np.median(reference)),
+        'runs': len(times),
+        'peak_mb': peak / 1e6,
+        'alloc_blocks': max(blocks, 0),
+    }
+
+
+def run(sizes):
+    results = {}
+    for bars in sizes:
+        data = synthetic_ohlcv(bars)
+        for name, func in BENCHMARKS.items():
+            stats = measure(func, data)
+            results[f"{name}@{bars}"] = stats
+            print(f"{name:<28}{bars:>12,} bars  {stats['seconds']*1000:>10.2f} ms  {stats['relative']:>7.2f}x ref  "
+                  f"{stats['peak_mb']:>9.1f} MB peak  {stats['alloc_blocks']:>8} blocks")
+    return results
+
+
+def compare(results, baseline, threshold, min_seconds=0.001):
+    """
+    Return list of regressions beyond threshold (e.g. 0.2 = 20% slower)
+    Time is compared relative to the calibration workload: not at all for
+    cases whose baseline is under min_seconds, with twice the threshold
+    under 10x min_seconds.
+    """
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in ('relative', 'peak_mb'):
+            allowed = threshold
+            if metric == 'relative':
+                if base['seconds'] < min_seconds:
+                    continue
+                if base['seconds'] < 10 * min_seconds:
+                    allowed = 2 * threshold
+            if base[metric] > 0 and stats[metric] > base[metric] * (1 + allowed):
+                change = (stats[metric] / base[metric] - 1) * 100
+                regressions.append(f"{key} {metric}: {base[metric]:.4g} -> {stats[metric]:.4g} (+{change:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the indicators module")
+    parser.add_argument('--max-bars', type=int, default=SIZES[-1])
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save', action='store_true', help="store results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+    parser.add_argument('--min-ms', type=float, default=1.0, help="don't gate timings of faster cases")
+    args = parser.parse_args()
+
+    sizes = [bars for bars in SIZES if bars <= args.max_bars]
+    print(f"⏱️  Benchmarking indicators ({platform.python_version()}, pandas {pd.__version__}, numpy {np.__version__})\n")
+    results = run(sizes)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'timing': 'relative',
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️  No baseline at {args.baseline} (run with --save first)")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        saved = json.load(f)
+    if saved.get('timing') != 'relative':
+        print(f"\n⚠️  {args.baseline} has no calibrated timings (re-run with --save)")
+        return 0
+
+    regressions = compare(results, saved['results'], args.threshold, args.min_ms / 1000)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold*100:.0f}%:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+
+    print(f"\n✅ No regressions beyond {args.threshold*100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
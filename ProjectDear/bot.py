@@ -3,32 +3,66 @@ Gold Scalping Bot - Main Trading Engine
 Strategy: Volatility Breakout Scalping
 """
 import json
-import time
 from datetime import datetime
 import signal
 import sys
+import time
 
-from broker import MT5Broker
-from indicators import generate_signals
+from broker import create_broker
+from execution import ExecutionPipeline
+from position_manager import PositionManager
+from profiler import CycleProfiler
+from signal_cache import SignalCache
 from logger import TradeLogger
+from scanner import MarketScanner
+from scheduler import BarScheduler
+from symbol_settings import symbol_config
 
 
 class GoldScalpingBot:
-    def __init__(self, config_path="config.json"):
+    def __init__(self, config_path="config.json", backend=None):
         # Load config
         with open(config_path, 'r') as f:
             self.config = json.load(f)
+        if backend:
+            self.config['mt5']['backend'] = backend
         
-        # Initialize components
-        self.broker = MT5Broker(self.config)
+        # Initialize components (native MetaTrader5 or Silicon bridge)
+        self.broker = create_broker(self.config)
         self.logger = TradeLogger()
+        self.signal_cache = SignalCache()
+        self.execution = ExecutionPipeline(self.broker)
+        self.positions = PositionManager(self.broker, self.logger, self.execution, self.config)
+        self.profiler = CycleProfiler(self.config)
+        
+        # Scanner mode: many symbols x timeframes instead of one symbol
+        self.scanner = None
+        if self.config.get('scanner', {}).get('enabled'):
+            self.scanner = MarketScanner(self.config, self.broker.get_rates)
         
         # Trading state
         self.running = False
+        self.has_open_positions = False
         self.trades_today = 0
         self.consecutive_losses = 0
         self.daily_profit = 0.0
         
+        # Main loop: wake at bar close, on tick changes while a position is
+        # open, and sleep through closed sessions
+        symbol = self.config['strategy']['symbol']
+        if self.scanner:
+            timeframes = self.scanner.timeframes
+        else:
+            timeframes = [self.config['strategy']['timeframe']]
+        self.scheduler = BarScheduler(
+            self.config,
+            timeframes,
+            on_bar_close=lambda closed: self.run_cycle(),
+            on_tick=None if self.scanner else (lambda tick: self.run_cycle()),
+            tick_source=lambda: self.broker.get_tick(symbol),
+            has_positions=lambda: self.has_open_positions
+        )
+        
         print("🤖 Gold Scalping Bot initialized")
         print(f"   Symbol: {self.config['strategy']['symbol']}")
         print(f"   Risk: {self.config['strategy']['risk_percent']}% per trade")
@@ -41,34 +75,26 @@ class GoldScalpingBot:
             print("❌ Cannot connect to MT5. Exiting.")
             return
         
+        if self.scanner:
+            self.scanner.start()
+        
         self.running = True
         print("\n🚀 Bot started! Monitoring market...\n")
-        
-        # Main loop
         try:
-            while self.running:
-                self.run_cycle()
-                time.sleep(30)  # Check every 30 seconds
+            self.scheduler.run()
         except KeyboardInterrupt:
             print("\n⚠️  Bot stopped by user")
         finally:
             self.stop()
     
     def run_cycle(self):
-        """Single trading cycle"""
-        # Check trading hours
-        current_hour = datetime.now().hour
-        start_hour = self.config['strategy']['trading_hours']['start']
-        end_hour = self.config['strategy']['trading_hours']['end']
-        
-        # Handle overnight trading (e.g., 14:00-02:00)
-        in_trading_hours = False
-        if start_hour < end_hour:
-            in_trading_hours = start_hour <= current_hour < end_hour
-        else:  # Crosses midnight
-            in_trading_hours = current_hour >= start_hour or current_hour < end_hour
-        
-        if not in_trading_hours:
+        """Single trading cycle (timed per stage)"""
+        with self.profiler.stage('cycle'):
+            self._run_cycle()
+        self.profiler.maybe_dump()
+    
+    def _run_cycle(self):
+        if not self.scheduler.in_session(datetime.now().hour):
             return
         
         # Check max trades limit
@@ -81,55 +107,109 @@ class GoldScalpingBot:
             print(f"⏸️  Max consecutive losses ({self.consecutive_losses}). Stopped for today.")
             return
         
+        if self.scanner:
+            self._run_scan_cycle()
+            return
+        
         # Get market data
         symbol = self.config['strategy']['symbol']
         timeframe = self.config['strategy']['timeframe']
-        data = self.broker.get_data(symbol, timeframe, bars=100)
+        with self.profiler.stage('get_data'):
+            data = self.broker.get_rates(symbol, timeframe, bars=100)
         
         if data is None or len(data) == 0:
             print("⚠️  No data received")
             return
         
-        # Generate signals
-        data = generate_signals(data, self.config)
-        latest = data.iloc[-1]
+        # Generate signals (cached until a new bar closes)
+        with self.profiler.stage('generate_signals'):
+            latest = self.signal_cache.get(symbol, timeframe, data, symbol_config(self.config, symbol))
         signal = latest['signal']
         
-        # Check for existing positions
-        positions = self.broker.get_open_positions(symbol)
+        # Tick, existing positions and account in one round trip
+        with self.profiler.stage('snapshot'):
+            tick, positions, account_info = self.broker.snapshot(symbol)
+        self.has_open_positions = len(positions) > 0
         
-        # Manage existing positions
-        for pos in positions:
-            self._manage_position(pos, latest)
+        # Manage existing positions (batched exits)
+        with self.profiler.stage('manage_positions'):
+            self._manage_positions(positions, {symbol: latest}, {symbol: tick})
         
         # No signal or already have position
         if signal == 0 or len(positions) > 0:
             return
         
         # Execute trade
+        balance = account_info.balance if account_info else None
         if signal == 1:  # BUY
-            self._execute_trade("BUY", latest)
+            self._execute_trade("BUY", latest, balance=balance)
         elif signal == -1:  # SELL
-            self._execute_trade("SELL", latest)
+            self._execute_trade("SELL", latest, balance=balance)
     
-    def _execute_trade(self, order_type, market_data):
-        """Execute a trade"""
-        symbol = self.config['strategy']['symbol']
+    def _run_scan_cycle(self):
+        """Scanner mode: evaluate all symbols x timeframes, trade any signals"""
+        with self.profiler.stage('scan'):
+            results = self.scanner.scan()
+        
+        # One positions call for all symbols
+        open_symbols = {}
+        with self.profiler.stage('get_open_positions'):
+            positions = self.broker.get_open_positions()
+        for pos in positions:
+            open_symbols.setdefault(pos.symbol, []).append(pos)
+        self.has_open_positions = len(open_symbols) > 0
+        
+        # Results come in config order, so the first timeframe listed for a
+        # symbol drives its position management and wins signal conflicts
+        first_results = {}
+        for latest in results:
+            first_results.setdefault(latest['symbol'], latest)
+        
+        # All symbols' exits decided and sent in one batch
+        with self.profiler.stage('manage_positions'):
+            self._manage_positions(
+                positions,
+                {symbol: first_results[symbol] for symbol in open_symbols if symbol in first_results}
+            )
+        
+        handled = set(open_symbols)
+        for latest in results:
+            symbol = latest['symbol']
+            if symbol in handled:
+                continue
+            
+            if latest['signal'] == 0:
+                continue
+            if self.trades_today >= self.config['strategy']['max_trades_per_day']:
+                break
+            
+            handled.add(symbol)
+            order_type = "BUY" if latest['signal'] == 1 else "SELL"
+            print(f"🔭 {symbol} {latest['timeframe']}: {order_type} signal")
+            self._execute_trade(order_type, latest, symbol=symbol)
+    
+    def _execute_trade(self, order_type, market_data, symbol=None, balance=None):
+        """Execute a trade (balance: from this cycle's snapshot, if taken)"""
+        symbol = symbol or self.config['strategy']['symbol']
         risk_percent = self.config['strategy']['risk_percent']
         sl_pips = self.config['strategy']['stop_loss_pips']
         tp_pips = self.config['strategy']['take_profit_pips']
         
         # Calculate lot size
-        lot_size = self.broker.calculate_lot_size(symbol, risk_percent, sl_pips)
+        with self.profiler.stage('calculate_lot_size'):
+            lot_size = self.broker.calculate_lot_size(symbol, risk_percent, sl_pips, balance=balance)
         
-        # Place order
-        result = self.broker.place_order(symbol, order_type, lot_size, sl_pips, tp_pips, 
-                                         comment=f"Scalp_{order_type}")
+        # Place order through the execution pipeline (its histograms split
+        # queue wait / tick / send; this stage is the end-to-end wait)
+        with self.profiler.stage('place_order'):
+            result = self.execution.submit_order(symbol, order_type, lot_size, sl_pips, tp_pips,
+                                                 comment=f"Scalp_{order_type}").result()
         
         if result:
             self.trades_today += 1
             
             # Log trade
+            log_started = time.perf_counter()
             self.logger.log_trade({
                 'timestamp': datetime.now().isoformat(),
                 'symbol': symbol,
@@ -143,6 +223,7 @@ class GoldScalpingBot:
                 'status': 'OPEN',
                 'comment': f"RSI: {market_data['rsi']:.2f}, ATR: {market_data['atr']:.2f}"
             })
+            self.profiler.record('log_trade', time.perf_counter() - log_started)
             
             print(f"\n💰 Trade #{self.trades_today} executed!")
             print(f"   Type: {order_type}")
@@ -150,41 +231,14 @@ class GoldScalpingBot:
             print(f"   Lot: {lot_size}")
             print(f"   RSI: {market_data['rsi']:.2f} | ATR: {market_data['atr']:.2f}\n")
     
-    def _manage_position(self, position, market_data):
-        """Manage open position (trailing stop, emergency exit)"""
-        # Emergency exit on RSI reversal
-        if position.type == 0:  # BUY position
-            if market_data['rsi'] > 70:  # Overbought
-                self.broker.close_position(position)
-                print("🚨 Emergency close (RSI overbought)")
-                self._log_closed_trade(position, "EMERGENCY_EXIT")
-        else:  # SELL position
-            if market_data['rsi'] < 30:  # Oversold
-                self.broker.close_position(position)
-                print("🚨 Emergency close (RSI oversold)")
-                self._log_closed_trade(position, "EMERGENCY_EXIT")
-        
-        # TODO: Implement trailing stop logic
+    def _manage_positions(self, positions, market_data, ticks=None):
+        """Manage open positions (emergency exit), all symbols in one batch"""
+        for position, reason in self.positions.manage(positions, market_data, ticks):
+            self._record_closed_trade(position)
     
-    def _log_closed_trade(self, position, reason=""):
-        """Log closed trade result"""
+    def _record_closed_trade(self, position):
+        """Update daily stats for a closed trade (logged by PositionManager)"""
         profit = position.profit
-        status = "WIN" if profit > 0 else "LOSS"
-        
-        self.logger.log_trade({
-            'timestamp': datetime.now().isoformat(),
-            'symbol': position.symbol,
-            'type': 'BUY' if position.type == 0 else 'SELL',
-            'lot_size': position.volume,
-            'entry_price': position.price_open,
-            'sl': position.sl,
-            'tp': position.tp,
-            'exit_price': position.price_current,
-            'profit': profit,
-            'status': status,
-            'comment': reason
-        })
-        
         self.daily_profit += profit
         
         if profit > 0:
@@ -199,7 +253,15 @@ class GoldScalpingBot:
     def stop(self):
         """Stop the bot"""
         self.running = False
+        self.scheduler.stop()
+        if self.scanner:
+            self.scanner.shutdown()
+        self.execution.stop()
         self.logger.print_summary()
+        self.logger.close()
+        self.profiler.print_stats()
+        self.execution.print_stats()
+        self.signal_cache.print_stats()
         self.broker.disconnect()
         print("\n👋 Bot stopped. See you next time!\n")
 
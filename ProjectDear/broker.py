@@ -2,30 +2,70 @@
 Broker Module
 Handle MT5 connection and order execution
 """
-import MetaTrader5 as mt5
 import pandas as pd
 from datetime import datetime
 import time
 
+import numpy as np
+
+from account_state import AccountState
+from bar_aggregator import TIMEFRAME_SECONDS
+from history_store import HistoryStore
+from symbol_cache import SymbolCache
+from symbol_settings import pip_value
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:  # macOS: use the Silicon backend (config: mt5.backend)
+    mt5 = None
+
 
 class MT5Broker:
-    def __init__(self, config):
+    """
+    Broker interface used by the trading engine
+    connect/disconnect, get_data/get_rates/get_tick/get_ticks, snapshot,
+    get_open_positions, calculate_lot_size, place_order, close_position.
+    All terminal calls go through self.mt5 (the MetaTrader5 module here;
+    SiliconBroker swaps in a pooled siliconmetatrader5 client).
+    """
+    
+    def __init__(self, config, client=None):
         self.config = config
         self.connected = False
+        self.mt5 = client or mt5
+        if self.mt5 is None:
+            raise ImportError("MetaTrader5 not installed (on macOS set mt5.backend to \"silicon\")")
+        
+        # Symbol specs, loaded once per symbol (config: mt5.symbol_cache_ttl)
+        self.symbols = SymbolCache(self.mt5.symbol_info, ttl=config['mt5'].get('symbol_cache_ttl', 3600))
+        
+        # Optional local bar history (config: history.enabled)
+        self.history = None
+        if config.get('history', {}).get('enabled'):
+            self.history = HistoryStore(config['history'].get('path', 'history'))
+        
+        # Delta bar fetching (config: mt5.incremental_bars, default on)
+        self.incremental = config['mt5'].get('incremental_bars', True)
+        self._bar_buffers = {}  # (symbol, timeframe) -> (fetched at, rates buffer)
+        
+        # Balance/equity/margin served from memory (config: account.refresh_interval)
+        self.account = AccountState(self.get_account_info,
+                                    refresh_interval=config.get('account', {}).get('refresh_interval', 5.0))
         
     def connect(self):
         """Connect to MT5"""
-        if not mt5.initialize(
+        if not self.mt5.initialize(
             path=self.config['mt5'].get('path', ''),
             login=self.config['mt5']['login'],
             password=self.config['mt5']['password'],
             server=self.config['mt5']['server']
         ):
-            print(f"❌ MT5 connection failed: {mt5.last_error()}")
+            print(f"❌ MT5 connection failed: {self.mt5.last_error()}")
             return False
         
         self.connected = True
-        account_info = mt5.account_info()
+        self.account.start()
+        account_info = self.mt5.account_info()
         if account_info:
             print(f"✅ Connected to MT5")
             print(f"   Account: {account_info.login}")
@@ -35,57 +75,143 @@ class MT5Broker:
     
     def disconnect(self):
         """Disconnect from MT5"""
-        mt5.shutdown()
+        self.account.stop()
+        self.mt5.shutdown()
         self.connected = False
         print("🔌 Disconnected from MT5")
     
     def get_data(self, symbol, timeframe, bars=100):
         """Get historical data"""
+        rates = self.get_rates(symbol, timeframe, bars)
+        if rates is None:
+            return None
+        
+        df = pd.DataFrame(rates)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        return df
+    
+    def get_rates(self, symbol, timeframe, bars=100):
+        """
+        Get historical data as the raw MT5 rates array (no DataFrame)
+        In incremental mode the returned array is a persistent buffer that
+        is updated in place by the next call for the same symbol/timeframe.
+        """
         if not self.connected:
             return None
         
         # Convert timeframe string to MT5 constant
         tf_map = {
-            'M1': mt5.TIMEFRAME_M1,
-            'M5': mt5.TIMEFRAME_M5,
-            'M15': mt5.TIMEFRAME_M15,
-            'M30': mt5.TIMEFRAME_M30,
-            'H1': mt5.TIMEFRAME_H1,
-            'H4': mt5.TIMEFRAME_H4,
-            'D1': mt5.TIMEFRAME_D1
+            'M1': self.mt5.TIMEFRAME_M1,
+            'M5': self.mt5.TIMEFRAME_M5,
+            'M15': self.mt5.TIMEFRAME_M15,
+            'M30': self.mt5.TIMEFRAME_M30,
+            'H1': self.mt5.TIMEFRAME_H1,
+            'H4': self.mt5.TIMEFRAME_H4,
+            'D1': self.mt5.TIMEFRAME_D1
         }
         
-        rates = mt5.copy_rates_from_pos(symbol, tf_map.get(timeframe, mt5.TIMEFRAME_M5), 0, bars)
+        tf = tf_map.get(timeframe, self.mt5.TIMEFRAME_M5)
+        if self.incremental:
+            return self._get_rates_incremental(symbol, timeframe, tf, bars)
+        
+        rates = self.mt5.copy_rates_from_pos(symbol, tf, 0, bars)
+        if rates is not None and self.history:
+            self.history.append(symbol, timeframe, rates)
+        return rates
+    
+    def _get_rates_incremental(self, symbol, timeframe, tf, bars):
+        """
+        Fetch only the forming bar plus bars closed since the last call and
+        merge them into a fixed-size buffer. The request size comes from
+        the local monotonic clock (no server time zone involved); if the
+        delta does not overlap the buffer, fall back to a full fetch.
+        """
+        key = (symbol, timeframe)
+        state = self._bar_buffers.get(key)
+        now = time.monotonic()
+        
+        if state is not None and len(state[1]) == bars:
+            fetched_at, buffer = state
+            elapsed = now - fetched_at
+            count = int(elapsed // TIMEFRAME_SECONDS.get(timeframe, 300)) + 2
+            if count < bars:
+                delta = self.mt5.copy_rates_from_pos(symbol, tf, 0, count)
+                if delta is None:
+                    return None
+                
+                # Locate our last (forming) bar in the delta
+                last_time = buffer['time'][-1]
+                start = int(np.searchsorted(delta['time'], last_time))
+                if start < len(delta) and delta['time'][start] == last_time:
+                    fresh = delta[start:]
+                    shift = len(fresh) - 1
+                    if shift > 0:
+                        buffer[:-shift] = buffer[shift:]
+                    buffer[-len(fresh):] = fresh
+                    self._bar_buffers[key] = (now, buffer)
+                    if self.history:
+                        self.history.append(symbol, timeframe, fresh)
+                    return buffer
+        
+        # First call, gap, or lookback changed: full fetch
+        rates = self.mt5.copy_rates_from_pos(symbol, tf, 0, bars)
         if rates is None:
             return None
-        
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        return df
+        buffer = np.array(rates, copy=True)
+        if len(buffer) == bars:
+            self._bar_buffers[key] = (now, buffer)
+        if self.history:
+            self.history.append(symbol, timeframe, buffer)
+        return buffer
     
-    def get_account_balance(self):
-        """Get current account balance"""
+    def get_tick(self, symbol):
+        """Get latest tick"""
         if not self.connected:
             return None
-        account_info = mt5.account_info()
+        return self.mt5.symbol_info_tick(symbol)
+    
+    def get_ticks(self, symbol, date_from, count=1000):
+        """Get ticks since date_from (feed for TickBarAggregator.on_ticks)"""
+        if not self.connected:
+            return None
+        return self.mt5.copy_ticks_from(symbol, date_from, count, self.mt5.COPY_TICKS_ALL)
+    
+    def get_history(self, symbol, timeframe, start=None, end=None):
+        """Read stored bars (no broker call); None if history is disabled"""
+        if not self.history:
+            return None
+        return self.history.read(symbol, timeframe, start, end)
+    
+    def get_account_info(self):
+        """Raw account_info from the terminal (AccountState refreshes through this)"""
+        if not self.connected:
+            return None
+        return self.mt5.account_info()
+    
+    def get_account_balance(self):
+        """Get current account balance (in-memory, account_info until first refresh)"""
+        balance = self.account.balance
+        if balance is not None:
+            return balance
+        account_info = self.get_account_info()
         return account_info.balance if account_info else None
     
-    def calculate_lot_size(self, symbol, risk_percent, stop_loss_pips):
-        """Calculate lot size based on risk management"""
-        balance = self.get_account_balance()
+    def calculate_lot_size(self, symbol, risk_percent, stop_loss_pips, balance=None):
+        """Calculate lot size based on risk management (balance: skip the account_info call)"""
+        if balance is None:
+            balance = self.get_account_balance()
         if not balance:
             return 0.01  # Minimum lot
         
         risk_amount = balance * (risk_percent / 100)
         
-        # Get symbol info for pip value calculation
-        symbol_info = mt5.symbol_info(symbol)
+        # Get symbol info for pip value calculation (cached)
+        symbol_info = self.symbols.get(symbol)
         if not symbol_info:
             return 0.01
         
-        # For XAUUSD: 1 pip = $0.01 per 0.01 lot
-        pip_value = 0.01  # per 0.01 lot
-        lot_size = (risk_amount / stop_loss_pips) / pip_value
+        # Per 0.01 lot (XAUUSD: 1 pip = $0.01; other symbols: config['symbols'])
+        lot_size = (risk_amount / stop_loss_pips) / pip_value(self.config, symbol)
         
         # Round to MT5 lot step (usually 0.01)
         lot_size = round(lot_size / symbol_info.volume_step) * symbol_info.volume_step
@@ -95,93 +221,164 @@ class MT5Broker:
         
         return lot_size
     
-    def place_order(self, symbol, order_type, lot_size, sl_pips, tp_pips, comment=""):
-        """Place market order"""
+    def place_order(self, symbol, order_type, lot_size, sl_pips, tp_pips, comment="", timings=None):
+        """Place market order (re-priced and retried on requotes)"""
         if not self.connected:
             return None
         
-        # Get current price
-        tick = mt5.symbol_info_tick(symbol)
-        if not tick:
+        symbol_info = self.symbols.get(symbol)
+        if not symbol_info:
             return None
+        point = symbol_info.point
         
-        point = mt5.symbol_info(symbol).point
-        
-        if order_type == "BUY":
-            price = tick.ask
-            sl = price - sl_pips * point * 10  # XAUUSD: 1 pip = 10 points
-            tp = price + tp_pips * point * 10
-            order_type_mt5 = mt5.ORDER_TYPE_BUY
-        else:  # SELL
-            price = tick.bid
-            sl = price + sl_pips * point * 10
-            tp = price - tp_pips * point * 10
-            order_type_mt5 = mt5.ORDER_TYPE_SELL
-        
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": symbol,
-            "volume": lot_size,
-            "type": order_type_mt5,
-            "price": price,
-            "sl": sl,
-            "tp": tp,
-            "deviation": 10,
-            "magic": 234000,
-            "comment": comment,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
+        def build_request(tick):
+            if order_type == "BUY":
+                price = tick.ask
+                sl = price - sl_pips * point * 10  # XAUUSD: 1 pip = 10 points
+                tp = price + tp_pips * point * 10
+                order_type_mt5 = self.mt5.ORDER_TYPE_BUY
+            else:  # SELL
+                price = tick.bid
+                sl = price + sl_pips * point * 10
+                tp = price - tp_pips * point * 10
+                order_type_mt5 = self.mt5.ORDER_TYPE_SELL
+            
+            return {
+                "action": self.mt5.TRADE_ACTION_DEAL,
+                "symbol": symbol,
+                "volume": lot_size,
+                "type": order_type_mt5,
+                "price": price,
+                "sl": sl,
+                "tp": tp,
+                "deviation": 10,
+                "magic": 234000,
+                "comment": comment,
+                "type_time": self.mt5.ORDER_TIME_GTC,
+                "type_filling": self.mt5.ORDER_FILLING_IOC,
+            }
         
-        result = mt5.order_send(request)
+        result = self.send_order(symbol, build_request, timings=timings)
         
-        if result.retcode != mt5.TRADE_RETCODE_DONE:
-            print(f"❌ Order failed: {result.comment}")
+        if result is None or result.retcode != self.mt5.TRADE_RETCODE_DONE:
+            print(f"❌ Order failed: {result.comment if result else self.mt5.last_error()}")
             return None
         
-        print(f"✅ {order_type} order placed: {lot_size} lots @ {price:.2f}")
-        print(f"   SL: {sl:.2f} | TP: {tp:.2f}")
+        self.account.on_fill(lot_size, result.price, symbol_info.trade_contract_size)
+        
+        print(f"✅ {order_type} order placed: {lot_size} lots @ {result.price:.2f}")
+        print(f"   SL: {result.request.sl:.2f} | TP: {result.request.tp:.2f}")
         return result
     
+    def send_order(self, symbol, build_request, deadline=None, timings=None, tick=None):
+        """
+        Send an order built from a fresh tick, retrying requotes
+        build_request: callable(tick) -> order_send request dict.
+        Requote / price-changed / price-off retcodes are retried with a
+        new tick until `deadline` seconds (config: mt5.order_deadline)
+        have passed, waiting between attempts (config: mt5.requote_backoff
+        seconds, doubled per retry up to 8x) so the quote can move.
+        timings, if given, accumulates 'tick' and 'send' seconds and
+        counts 'attempts'. A snapshot `tick` may be passed for the first
+        attempt; retries always fetch a fresh one.
+        Returns: last order_send result (or None)
+        """
+        if deadline is None:
+            deadline = self.config['mt5'].get('order_deadline', 2.0)
+        give_up_at = time.monotonic() + deadline
+        backoff = self.config['mt5'].get('requote_backoff', 0.05)
+        max_backoff = backoff * 8
+        retry_retcodes = {
+            self.mt5.TRADE_RETCODE_REQUOTE,
+            self.mt5.TRADE_RETCODE_PRICE_CHANGED,
+            self.mt5.TRADE_RETCODE_PRICE_OFF,
+        }
+        
+        result = None
+        while True:
+            started = time.monotonic()
+            if tick is None:
+                tick = self.mt5.symbol_info_tick(symbol)
+            ticked = time.monotonic()
+            if not tick:
+                return result
+            
+            result = self.mt5.order_send(build_request(tick))
+            sent = time.monotonic()
+            
+            if timings is not None:
+                timings['tick'] = timings.get('tick', 0.0) + (ticked - started)
+                timings['send'] = timings.get('send', 0.0) + (sent - ticked)
+                timings['attempts'] = timings.get('attempts', 0) + 1
+            
+            if result is None or result.retcode not in retry_retcodes or sent >= give_up_at:
+                return result
+            tick = None
+            print(f"🔁 {symbol}: {result.comment} (retcode {result.retcode}), retrying")
+            time.sleep(min(backoff, give_up_at - sent))
+            backoff = min(backoff * 2, max_backoff)
+    
+    def snapshot(self, symbol):
+        """
+        Tick, open positions and account state for one cycle
+        Native MT5 calls are in-process, so they simply run in sequence;
+        the account comes from AccountState (no call once loaded).
+        Returns: (tick, positions list, AccountSnapshot or account_info)
+        """
+        if not self.connected:
+            return None, [], None
+        tick = self.mt5.symbol_info_tick(symbol)
+        positions = self.mt5.positions_get(symbol=symbol)
+        return tick, list(positions) if positions else [], self.account.snapshot() or self.mt5.account_info()
+    
     def get_open_positions(self, symbol=None):
         """Get all open positions"""
         if not self.connected:
             return []
         
         if symbol:
-            positions = mt5.positions_get(symbol=symbol)
+            positions = self.mt5.positions_get(symbol=symbol)
         else:
-            positions = mt5.positions_get()
+            positions = self.mt5.positions_get()
         
         return list(positions) if positions else []
     
-    def close_position(self, position):
-        """Close a specific position"""
+    def close_position(self, position, comment="Close by bot", timings=None, tick=None):
+        """Close a specific position (re-priced and retried on requotes)"""
         if not self.connected:
             return None
         
-        tick = mt5.symbol_info_tick(position.symbol)
-        if not tick:
-            return None
-        
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": position.symbol,
-            "volume": position.volume,
-            "type": mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY,
-            "position": position.ticket,
-            "price": tick.bid if position.type == mt5.ORDER_TYPE_BUY else tick.ask,
-            "deviation": 10,
-            "magic": 234000,
-            "comment": "Close by bot",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
+        def build_request(tick):
+            return {
+                "action": self.mt5.TRADE_ACTION_DEAL,
+                "symbol": position.symbol,
+                "volume": position.volume,
+                "type": self.mt5.ORDER_TYPE_SELL if position.type == self.mt5.ORDER_TYPE_BUY else self.mt5.ORDER_TYPE_BUY,
+                "position": position.ticket,
+                "price": tick.bid if position.type == self.mt5.ORDER_TYPE_BUY else tick.ask,
+                "deviation": 10,
+                "magic": 234000,
+                "comment": comment,
+                "type_time": self.mt5.ORDER_TIME_GTC,
+                "type_filling": self.mt5.ORDER_FILLING_IOC,
+            }
         
-        result = mt5.order_send(request)
-        if result.retcode != mt5.TRADE_RETCODE_DONE:
-            print(f"❌ Close failed: {result.comment}")
+        result = self.send_order(position.symbol, build_request, timings=timings, tick=tick)
+        if result is None or result.retcode != self.mt5.TRADE_RETCODE_DONE:
+            print(f"❌ Close failed: {result.comment if result else self.mt5.last_error()}")
             return None
         
+        spec = self.symbols.get(position.symbol)
+        self.account.on_close(position.volume, position.price_open,
+                              spec.trade_contract_size if spec else 0, position.profit)
+        
         print(f"🔒 Position closed: {position.ticket}")
         return result
+
+
+def create_broker(config):
+    """Broker for config['mt5']['backend']: "native" (default) or "silicon" """
+    if config['mt5'].get('backend', 'native') == 'silicon':
+        from broker_silicon import SiliconBroker
+        return SiliconBroker(config)
+    return MT5Broker(config)
@@ -0,0 +1,110 @@
+"""
+Silicon Broker Module
+MT5Broker over siliconmetatrader5 (macOS M1/M2/M3, MT5 in Docker) with a
+pool of persistent bridge connections
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from siliconmetatrader5 import MetaTrader5
+except ImportError:
+    MetaTrader5 = None
+
+from broker import MT5Broker
+
+
+class SiliconPool:
+    """
+    N persistent siliconmetatrader5 clients behind the MetaTrader5 API
+    Attribute access returns the client's constants (TIMEFRAME_M5, ...);
+    every call borrows a free connection for its round trip, so calls
+    from different threads (execution workers, scanner, snapshot) travel
+    in parallel instead of queueing on one socket.
+    """
+
+    def __init__(self, host="localhost", port=8001, size=4):
+        self.size = size
+        self.clients = [MetaTrader5(host=host, port=port, keepalive=True) for _ in range(size)]
+        self.idle = queue.Queue()
+        for client in self.clients:
+            self.idle.put(client)
+
+    def __getattr__(self, name):
+        attr = getattr(self.clients[0], name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            client = self.idle.get()
+            try:
+                return getattr(client, name)(*args, **kwargs)
+            finally:
+                self.idle.put(client)
+        return call
+
+    def close(self):
+        """Shut down every connection"""
+        for client in self.clients:
+            client.shutdown()
+
+
+class SiliconBroker(MT5Broker):
+    """
+    Same interface as MT5Broker; the terminal runs in Docker behind the
+    Silicon bridge (config: mt5.silicon host, port, pool_size)
+    snapshot() sends its tick, positions and account_info calls at once
+    over separate pooled connections, so a cycle pays one round trip
+    instead of three.
+    """
+
+    def __init__(self, config):
+        if MetaTrader5 is None:
+            raise ImportError("siliconmetatrader5 not installed (run: pip3 install siliconmetatrader5)")
+        settings = config['mt5'].get('silicon', {})
+        pool = SiliconPool(settings.get('host', 'localhost'),
+                           settings.get('port', 8001),
+                           settings.get('pool_size', 4))
+        super().__init__(config, client=pool)
+        self.pipeline = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="silicon")
+
+    def connect(self):
+        """Check the bridge and the terminal login (login itself is done via VNC)"""
+        if not self.mt5.ping():
+            print("❌ Cannot connect to MT5. Is Docker running?")
+            print("   Run: cd silicon-metatrader5/docker && docker compose up")
+            return False
+
+        account_info = self.mt5.account_info()
+        if not account_info:
+            print("⚠️  Not logged in. Login via VNC:")
+            print("   http://localhost:6081/vnc.html (password: 123456)")
+            return False
+
+        self.connected = True
+        self.account.start()
+        print(f"✅ Connected to MT5 (Silicon, {self.mt5.size} connections)")
+        print(f"   Account: {account_info.login}")
+        print(f"   Balance: ${account_info.balance:.2f}")
+        print(f"   Server: {account_info.server}")
+        return True
+
+    def disconnect(self):
+        """Close all bridge connections"""
+        self.account.stop()
+        self.pipeline.shutdown(wait=True)
+        self.mt5.close()
+        self.connected = False
+        print("🔌 Disconnected from MT5")
+
+    def snapshot(self, symbol):
+        """Tick and positions pipelined over the pool (account from memory once loaded)"""
+        if not self.connected:
+            return None, [], None
+        tick = self.pipeline.submit(self.mt5.symbol_info_tick, symbol)
+        positions = self.pipeline.submit(self.mt5.positions_get, symbol=symbol)
+        account_info = self.account.snapshot()
+        if account_info is None:
+            account_info = self.pipeline.submit(self.mt5.account_info).result()
+        positions = positions.result()
+        return tick.result(), list(positions) if positions else [], account_info
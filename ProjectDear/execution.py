@@ -0,0 +1,155 @@
+"""
+Execution Module
+Queue-based order pipeline with per-stage latency histograms
+"""
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced buckets (10us .. ~100s) plus count/sum/max
+    Recording is a bisect and an increment; percentiles are estimated
+    from the bucket upper bounds.
+    """
+
+    BOUNDS = [10e-6 * 2 ** (i / 2) for i in range(47)]  # ~1.41x per bucket
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        index = bisect.bisect_left(self.BOUNDS, seconds)
+        with self.lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (seconds)"""
+        if self.count == 0:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class ExecutionPipeline:
+    """
+    Orders go into a bounded queue and are sent by a pool of worker threads
+    Orders on the same symbol are sent one at a time (per-symbol lock);
+    different symbols go out in parallel. Requotes are retried inside
+    MT5Broker.send_order with a fresh tick until the deadline.
+    Every order records queue wait, tick fetch, send and total latency.
+    """
+
+    STAGES = ('queue_wait', 'tick', 'send', 'total')
+
+    def __init__(self, broker, workers=4, queue_size=100):
+        self.broker = broker
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+        self.symbol_locks = {}
+        self.locks_guard = threading.Lock()
+        self.threads = []
+        self.running = False
+
+    def start(self):
+        """Start worker threads"""
+        self.running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"exec-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Finish queued orders, then stop workers"""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        self.running = False
+
+    def submit_order(self, symbol, order_type, lot_size, sl_pips, tp_pips, comment=""):
+        """Queue a market order. Returns: Future -> order_send result or None"""
+        return self._submit(symbol, self.broker.place_order,
+                            (symbol, order_type, lot_size, sl_pips, tp_pips, comment), {})
+
+    def submit_close(self, position, comment="Close by bot", tick=None):
+        """
+        Queue a position close (tick: optional snapshot for the first attempt)
+        Returns: Future -> order_send result or None
+        """
+        return self._submit(position.symbol, self.broker.close_position,
+                            (position, comment), {'tick': tick})
+
+    def _submit(self, symbol, send, args, kwargs):
+        if not self.running:
+            self.start()
+        future = Future()
+        self.queue.put((time.monotonic(), symbol, send, args, kwargs, future))
+        return future
+
+    def _symbol_lock(self, symbol):
+        with self.locks_guard:
+            lock = self.symbol_locks.get(symbol)
+            if lock is None:
+                lock = self.symbol_locks[symbol] = threading.Lock()
+            return lock
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            enqueued, symbol, send, args, kwargs, future = job
+            dequeued = time.monotonic()
+            timings = {}
+            try:
+                with self._symbol_lock(symbol):
+                    result = send(*args, timings=timings, **kwargs)
+                future.set_result(result)
+            except Exception as e:
+                print(f"❌ Execution error ({symbol}): {e}")
+                future.set_exception(e)
+            finally:
+                done = time.monotonic()
+                self.histograms['queue_wait'].record(dequeued - enqueued)
+                self.histograms['tick'].record(timings.get('tick', 0.0))
+                self.histograms['send'].record(timings.get('send', 0.0))
+                self.histograms['total'].record(done - enqueued)
+
+    def stats(self):
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def print_stats(self):
+        """Print latency percentiles per stage"""
+        print("\n⏱️  Execution latency (ms)")
+        for stage, s in self.stats().items():
+            print(f"   {stage:<11} n={s['count']:<6} p50 {s['p50']*1000:8.2f} | "
+                  f"p90 {s['p90']*1000:8.2f} | p99 {s['p99']*1000:8.2f} | max {s['max']*1000:8.2f}")
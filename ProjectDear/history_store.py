@@ -0,0 +1,190 @@
+"""
+History Store Module
+Local on-disk OHLCV history: one append-only column file per field,
+read back as memory-mapped NumPy views
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+
+from bar_aggregator import RATES_DTYPE
+
+
+# One column file per MT5 rates field
+FIELDS = [(name, RATES_DTYPE[name]) for name in RATES_DTYPE.names]
+
+
+def _to_epoch(value):
+    """datetime / numpy datetime64 / epoch seconds -> int epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, np.datetime64):
+        return int(value.astype('datetime64[s]').astype(np.int64))
+    return int(value)
+
+
+def _epoch_column(times):
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return times.astype('datetime64[s]').astype(np.int64)
+    if times.dtype == object:
+        # tz-aware pandas timestamps (e.g. Yahoo Finance)
+        return np.array([int(t.timestamp()) for t in times], dtype=np.int64)
+    return times.astype(np.int64)
+
+
+class HistoryView:
+    """
+    Bars read from the store (behaves like an MT5 rates array)
+    view['close'] is a zero-copy memmap slice; slicing returns a new view.
+    """
+
+    def __init__(self, columns):
+        self._columns = columns
+        self.dtype = np.dtype([(name, columns[name].dtype) for name, _ in FIELDS])
+
+    def __len__(self):
+        return len(self._columns['time'])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key]
+        return HistoryView({name: values[key] for name, values in self._columns.items()})
+
+    def to_rates(self):
+        """Copy into a regular MT5-style structured array"""
+        rates = np.empty(len(self), dtype=self.dtype)
+        for name, values in self._columns.items():
+            rates[name] = values
+        return rates
+
+    def to_frame(self):
+        """Copy into a DataFrame (time as datetime, like MT5Broker.get_data)"""
+        import pandas as pd
+        df = pd.DataFrame({name: np.asarray(values) for name, values in self._columns.items()})
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        return df
+
+
+class HistoryStore:
+    """
+    history/<symbol>/<timeframe>/<field>.bin
+    Files only grow: append() skips bars older than the last stored bar and
+    overwrites the last bar in place when it is sent again (forming bar).
+    The time column is sorted, so range reads are binary searches.
+    time.bin is written last and marks which bars are complete; columns
+    left longer by an interrupted append are cut back to the shortest
+    one before this store first writes to them.
+    Single writer per symbol/timeframe.
+    """
+
+    def __init__(self, root="history"):
+        self.root = root
+        self._maps = {}  # path -> (size, memmap)
+        self._repaired = set()  # folders checked since opening
+
+    def append(self, symbol, timeframe, rates):
+        """Store new bars (MT5 rates array or DataFrame). Returns bars added"""
+        if rates is None or len(rates) == 0:
+            return 0
+
+        folder = self._folder(symbol, timeframe)
+        os.makedirs(folder, exist_ok=True)
+        if folder not in self._repaired:
+            self._repair(folder)
+            self._repaired.add(folder)
+
+        times = _epoch_column(rates['time'])
+        last_time = self.last_time(symbol, timeframe)
+
+        start = 0
+        overwrite = False
+        if last_time is not None:
+            start = int(np.searchsorted(times, last_time, side='left'))
+            if start < len(times) and times[start] == last_time:
+                overwrite = True
+
+        if start >= len(times):
+            return 0
+
+        names = _field_names(rates)
+        # time last: a bar only counts once its time is on disk
+        for name, dtype in sorted(FIELDS, key=lambda field: field[0] == 'time'):
+            if name == 'time':
+                column = times[start:]
+            elif name in names:
+                column = np.asarray(rates[name][start:]).astype(dtype, copy=False)
+            else:
+                column = np.zeros(len(times) - start, dtype=dtype)
+
+            path = os.path.join(folder, f"{name}.bin")
+            with open(path, 'r+b' if overwrite else 'ab') as f:
+                if overwrite:
+                    # Rewrite the last stored bar, then append the rest
+                    f.seek(-np.dtype(dtype).itemsize, os.SEEK_END)
+                f.write(np.ascontiguousarray(column, dtype=dtype).tobytes())
+
+        return len(times) - start - (1 if overwrite else 0)
+
+    def read(self, symbol, timeframe, start=None, end=None):
+        """
+        Bars with start <= time < end (datetime or epoch seconds)
+        Returns: HistoryView of zero-copy memmap slices
+        """
+        columns = {name: self._column(symbol, timeframe, name, dtype) for name, dtype in FIELDS}
+        times = columns['time']
+        # Other columns run ahead of time.bin while an append is in flight
+        columns = {name: values[:len(times)] for name, values in columns.items()}
+
+        lo = 0 if start is None else int(np.searchsorted(times, _to_epoch(start), side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, _to_epoch(end), side='left'))
+        return HistoryView({name: values[lo:hi] for name, values in columns.items()})
+
+    def tail(self, symbol, timeframe, bars=100):
+        """Last N bars (warm start without asking the broker)"""
+        view = self.read(symbol, timeframe)
+        return view[max(0, len(view) - bars):]
+
+    def last_time(self, symbol, timeframe):
+        """Time of the last stored bar (epoch seconds) or None"""
+        times = self._column(symbol, timeframe, 'time', np.int64)
+        return int(times[-1]) if len(times) else None
+
+    def _folder(self, symbol, timeframe):
+        return os.path.join(self.root, symbol, timeframe)
+
+    def _repair(self, folder):
+        """Truncate every column file to the row count of the shortest"""
+        sizes = {}
+        for name, dtype in FIELDS:
+            path = os.path.join(folder, f"{name}.bin")
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            sizes[path] = (size, np.dtype(dtype).itemsize)
+        rows = min(size // itemsize for size, itemsize in sizes.values())
+        for path, (size, itemsize) in sizes.items():
+            if size > rows * itemsize:
+                print(f"⚠️  History: truncating {path} to {rows} bars (interrupted append)")
+                os.truncate(path, rows * itemsize)
+                self._maps.pop(path, None)
+
+    def _column(self, symbol, timeframe, name, dtype):
+        path = os.path.join(self._folder(symbol, timeframe), f"{name}.bin")
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        rows = size // np.dtype(dtype).itemsize  # ignore a torn trailing row
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+
+        # Re-map only when the file has grown
+        cached = self._maps.get(path)
+        if cached is None or cached[0] != size:
+            cached = (size, np.memmap(path, dtype=dtype, mode='r', shape=(rows,)))
+            self._maps[path] = cached
+        return cached[1]
+
+
+def _field_names(data):
+    names = getattr(getattr(data, 'dtype', None), 'names', None)
+    return names if names is not None else list(data.columns)
@@ -2,8 +2,11 @@
 Indicators Module
 Calculate RSI, Bollinger Bands, ATR for trading signals
 """
+import itertools
+
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def calculate_rsi(data, period=14):
@@ -94,3 +97,478 @@ def generate_signals(data, config):
     data.loc[sell_conditions, 'signal'] = -1
     
     return data
+
+
+def _signal_from_values(close, rsi, bb_upper, bb_lower, atr, indicators):
+    """Scalar version of the generate_signals buy/sell rules"""
+    # NaN comparisons are False, same as the pandas masks above
+    if atr > indicators['atr_threshold']:
+        if close < bb_lower and indicators['rsi_oversold'] < rsi < 50:
+            return 1
+        if close > bb_upper and 50 < rsi < indicators['rsi_overbought']:
+            return -1
+    return 0
+
+
+class _RollingWindow:
+    """Fixed-size window keeping running sums for O(1) mean/std updates"""
+
+    def __init__(self, period):
+        self.period = period
+        self.values = [0.0] * period
+        self.count = 0
+        self.head = 0  # slot of the newest value
+        self.nonzero = 0
+        self.anchor = None
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.pushes = 0
+
+    def push(self, x):
+        """Append a value, dropping the oldest one once the window is full"""
+        if self.anchor is None:
+            self.anchor = x
+        if self.count == self.period:
+            self.head = (self.head + 1) % self.period
+            self._remove(self.values[self.head])
+        else:
+            self.head = self.count
+            self.count += 1
+        self.values[self.head] = x
+        self._add(x)
+
+        # Re-sum once per window length so rounding drift stays bounded
+        self.pushes += 1
+        if self.pushes >= self.period:
+            self._resum()
+
+    def replace_last(self, x):
+        """Replace the newest value (forming bar revised)"""
+        self._remove(self.values[self.head])
+        self.values[self.head] = x
+        self._add(x)
+
+    def full(self):
+        return self.count == self.period
+
+    def mean(self):
+        if not self.full():
+            return np.nan
+        if self.nonzero == 0:
+            return 0.0
+        return self.anchor + self.sum / self.period
+
+    def std(self):
+        """Sample standard deviation (ddof=1, same as pandas)"""
+        if not self.full() or self.period < 2:
+            return np.nan
+        n = self.period
+        var = (self.sumsq - self.sum * self.sum / n) / (n - 1)
+        return np.sqrt(var) if var > 0 else 0.0
+
+    def _add(self, x):
+        d = x - self.anchor
+        self.sum += d
+        self.sumsq += d * d
+        if x != 0:
+            self.nonzero += 1
+
+    def _remove(self, x):
+        d = x - self.anchor
+        self.sum -= d
+        self.sumsq -= d * d
+        if x != 0:
+            self.nonzero -= 1
+
+    def _resum(self):
+        window = self.values[:self.count]
+        self.anchor = self.values[self.head]
+        self.sum = 0.0
+        self.sumsq = 0.0
+        for x in window:
+            d = x - self.anchor
+            self.sum += d
+            self.sumsq += d * d
+        self.pushes = 0
+
+
+class IncrementalIndicators:
+    """
+    Streaming version of generate_signals
+    Keeps running sums per indicator so each new or revised bar costs O(1)
+    instead of recomputing every rolling window. Values match the batch
+    functions above (simple rolling means, not Wilder smoothing) up to
+    floating-point rounding, so signals are the same.
+    """
+
+    def __init__(self, config):
+        self.indicators = config['indicators']
+        self.reset()
+
+    def reset(self):
+        """Drop all state (next sync reseeds from the full window)"""
+        ind = self.indicators
+        self.gains = _RollingWindow(ind['rsi_period'])
+        self.losses = _RollingWindow(ind['rsi_period'])
+        self.closes = _RollingWindow(ind['bb_period'])
+        self.true_ranges = _RollingWindow(ind['atr_period'])
+        self.volumes = _RollingWindow(ind['volume_ma_period'])
+        self.has_volume = True
+        self.prev_close = None  # close of the bar before the forming bar
+        self.last_bar = None
+        self.last_time = None
+        self.bars = 0
+
+    def update(self, bar):
+        """Append a new bar (the previous forming bar is now closed)"""
+        if self.last_bar is not None:
+            self.prev_close = self.last_bar['close']
+        gain, loss, tr = self._bar_terms(bar)
+        self.gains.push(gain)
+        self.losses.push(loss)
+        self.closes.push(bar['close'])
+        self.true_ranges.push(tr)
+        self._push_volume(bar, replace=False)
+        self.last_bar = bar
+        self.last_time = bar.get('time')
+        self.bars += 1
+        return self.latest()
+
+    def revise(self, bar):
+        """Replace the forming (latest) bar with updated prices"""
+        if self.last_bar is None:
+            return self.update(bar)
+        gain, loss, tr = self._bar_terms(bar)
+        self.gains.replace_last(gain)
+        self.losses.replace_last(loss)
+        self.closes.replace_last(bar['close'])
+        self.true_ranges.replace_last(tr)
+        self._push_volume(bar, replace=True)
+        self.last_bar = bar
+        self.last_time = bar.get('time')
+        return self.latest()
+
+    def sync(self, data):
+        """
+        Feed a recent window of bars (DataFrame or MT5 rates array)
+        Only bars at or after the last seen bar time are processed: the
+        last known bar is revised, newer bars are appended. Reseeds from
+        the whole window when the history no longer overlaps.
+        Returns: dict with the latest bar's indicators and signal
+        """
+        n = len(data)
+        if n == 0:
+            return None
+
+        # Column views (no copy for rates arrays or float DataFrame columns)
+        times = np.asarray(data['time'])
+        columns = {
+            field: np.asarray(data[field])
+            for field in ('open', 'high', 'low', 'close', 'tick_volume')
+            if _has_field(data, field)
+        }
+
+        start = 0
+        if self.last_time is not None:
+            # Walk back from the end to the last bar we already know
+            start = n - 1
+            while start >= 0 and times[start] > self.last_time:
+                start -= 1
+            if start < 0 or times[start] != self.last_time:
+                self.reset()
+                start = 0
+
+        for i in range(start, n):
+            bar = {field: float(values[i]) for field, values in columns.items()}
+            bar['time'] = times[i]
+            if i == start and self.last_time is not None:
+                self.revise(bar)
+            else:
+                self.update(bar)
+
+        return self.latest()
+
+    def latest(self):
+        """Indicators and signal of the latest bar"""
+        if self.last_bar is None:
+            return None
+
+        std = self.closes.std()
+        middle = self.closes.mean()
+        upper = middle + std * self.indicators['bb_std']
+        lower = middle - std * self.indicators['bb_std']
+
+        gain = self.gains.mean()
+        loss = self.losses.mean()
+        if np.isnan(gain) or (gain == 0 and loss == 0):
+            rsi = np.nan
+        elif loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + gain / loss))
+
+        atr = self.true_ranges.mean()
+        volume_ma = self.volumes.mean()
+        volume_spike = bool(self.has_volume and self.last_bar['tick_volume'] > volume_ma)
+
+        close = self.last_bar['close']
+        return {
+            'time': self.last_time,
+            'open': self.last_bar.get('open'),
+            'high': self.last_bar.get('high'),
+            'low': self.last_bar.get('low'),
+            'close': close,
+            'tick_volume': self.last_bar.get('tick_volume'),
+            'rsi': rsi,
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'atr': atr,
+            'volume_spike': volume_spike,
+            'signal': _signal_from_values(close, rsi, upper, lower, atr, self.indicators),
+        }
+
+    def _bar_terms(self, bar):
+        """RSI gain/loss and true range contributed by one bar"""
+        high, low, close = bar['high'], bar['low'], bar['close']
+        if self.prev_close is None:
+            # First bar: diff() is NaN -> no gain/loss, TR is just the range
+            return 0.0, 0.0, high - low
+
+        delta = close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        return gain, loss, tr
+
+    def _push_volume(self, bar, replace):
+        if 'tick_volume' not in bar:
+            self.has_volume = False
+            return
+        if replace:
+            self.volumes.replace_last(bar['tick_volume'])
+        else:
+            self.volumes.push(bar['tick_volume'])
+
+
+class RatesSignalEngine:
+    """
+    DataFrame-free signal path for MT5 rates arrays
+    Reads the open/high/low/close/tick_volume fields of the structured
+    array returned by copy_rates_from_pos as views and only evaluates the
+    windows ending at the latest bar, using buffers allocated once.
+    Stateless between calls, so it also suits worker processes.
+    Returns the same values as the last row of generate_signals.
+    """
+
+    def __init__(self, config):
+        self.indicators = config['indicators']
+        ind = self.indicators
+        size = max(ind['rsi_period'], ind['bb_period'], ind['atr_period'], ind['volume_ma_period']) + 1
+        self._a = np.empty(size)
+        self._b = np.empty(size)
+        self._c = np.empty(size)
+
+    def evaluate(self, rates):
+        """
+        Indicators and signal of the latest bar in rates
+        Returns: dict (same keys as IncrementalIndicators.latest) or None
+        """
+        n = len(rates)
+        if n == 0:
+            return None
+
+        ind = self.indicators
+        close = rates['close']
+        high = rates['high']
+        low = rates['low']
+
+        rsi = self._rsi(close, ind['rsi_period'])
+        middle, std = self._mean_std(close, ind['bb_period'])
+        upper = middle + std * ind['bb_std']
+        lower = middle - std * ind['bb_std']
+        atr = self._atr(high, low, close, ind['atr_period'])
+
+        volume_spike = False
+        tick_volume = None
+        if _has_field(rates, 'tick_volume'):
+            tick_volume = float(rates['tick_volume'][-1])
+            period = ind['volume_ma_period']
+            if n >= period:
+                window = self._a[:period]
+                window[:] = rates['tick_volume'][n - period:]
+                volume_spike = bool(tick_volume > window.sum() / period)
+
+        last_close = float(close[-1])
+        return {
+            'time': rates['time'][-1] if _has_field(rates, 'time') else None,
+            'open': float(rates['open'][-1]) if _has_field(rates, 'open') else None,
+            'high': float(high[-1]),
+            'low': float(low[-1]),
+            'close': last_close,
+            'tick_volume': tick_volume,
+            'rsi': rsi,
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'atr': atr,
+            'volume_spike': volume_spike,
+            'signal': _signal_from_values(last_close, rsi, upper, lower, atr, ind),
+        }
+
+    def _window_diffs(self, close, period):
+        """Close-to-close changes of the last `period` bars (first bar's change is 0)"""
+        n = len(close)
+        diffs = self._a[:period]
+        if n > period:
+            np.subtract(close[n - period:], close[n - period - 1:n - 1], out=diffs)
+        else:
+            diffs[0] = 0.0
+            np.subtract(close[1:], close[:-1], out=diffs[1:])
+        return diffs
+
+    def _rsi(self, close, period):
+        if len(close) < period:
+            return np.nan
+        diffs = self._window_diffs(close, period)
+        gains = self._b[:period]
+        np.maximum(diffs, 0.0, out=gains)
+        gain = gains.sum()
+        np.minimum(diffs, 0.0, out=gains)
+        loss = -gains.sum()
+        if gain == 0 and loss == 0:
+            return np.nan
+        if loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+    def _mean_std(self, close, period):
+        n = len(close)
+        if n < period:
+            return np.nan, np.nan
+        window = self._b[:period]
+        window[:] = close[n - period:]
+        mean = window.sum() / period
+        np.subtract(window, mean, out=window)
+        np.multiply(window, window, out=window)
+        return mean, np.sqrt(window.sum() / (period - 1)) if period > 1 else np.nan
+
+    def _atr(self, high, low, close, period):
+        n = len(close)
+        if n < period:
+            return np.nan
+        start = n - period
+        tr = self._a[:period]
+        scratch = self._c[:period]
+        np.subtract(high[start:], low[start:], out=tr)
+        if start > 0:
+            prev_close = close[start - 1:n - 1]
+            np.subtract(high[start:], prev_close, out=scratch)
+            np.abs(scratch, out=scratch)
+            np.maximum(tr, scratch, out=tr)
+            np.subtract(low[start:], prev_close, out=scratch)
+        else:
+            # First bar has no previous close: TR is just high - low
+            np.subtract(high[1:], close[:-1], out=scratch[1:])
+            np.abs(scratch[1:], out=scratch[1:])
+            np.maximum(tr[1:], scratch[1:], out=tr[1:])
+            scratch[0] = 0.0
+            np.subtract(low[1:], close[:-1], out=scratch[1:])
+        np.abs(scratch, out=scratch)
+        np.maximum(tr, scratch, out=tr)
+        return tr.sum() / period
+
+
+def _has_field(data, field):
+    """Column check that works for DataFrames and NumPy structured arrays"""
+    names = getattr(getattr(data, 'dtype', None), 'names', None)
+    if names is not None:
+        return field in names
+    return field in data.columns
+
+
+def _rolling_mean(values, period):
+    """Rolling mean over a NumPy array (NaN until the window is full)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period).mean(axis=1)
+    return out
+
+
+def _rolling_std(values, period):
+    """Rolling sample standard deviation (ddof=1, same as pandas)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period).std(axis=1, ddof=1)
+    return out
+
+
+def generate_signal_grid(data, config, rsi_period=None, bb_period=None, bb_std=None,
+                         atr_period=None, atr_threshold=None):
+    """
+    Evaluate generate_signals for every combination of parameter values
+    Each argument is a list of values to sweep (None = value from config).
+    Every distinct rolling window is computed once and shared by all
+    combinations that use it; data is not modified.
+    Returns: (signals, combos) - int8 array of shape (len(combos), bars)
+             with -1/0/1 per bar, and the list of parameter dicts
+    """
+    ind = config['indicators']
+    grid = {
+        'rsi_period': rsi_period,
+        'bb_period': bb_period,
+        'bb_std': bb_std,
+        'atr_period': atr_period,
+        'atr_threshold': atr_threshold,
+    }
+    grid = {name: list(values) if values is not None else [ind[name]]
+            for name, values in grid.items()}
+    combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+    close = np.asarray(data['close'], dtype=float)
+    high = np.asarray(data['high'], dtype=float)
+    low = np.asarray(data['low'], dtype=float)
+    bars = len(close)
+
+    # Shared inputs
+    delta = np.diff(close, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    prev_close = np.roll(close, 1)
+    prev_close[:1] = np.nan
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi_masks = {}
+        for period in set(grid['rsi_period']):
+            rsi = 100 - (100 / (1 + _rolling_mean(gains, period) / _rolling_mean(losses, period)))
+            rsi_masks[period] = (
+                (rsi > ind['rsi_oversold']) & (rsi < 50),
+                (rsi < ind['rsi_overbought']) & (rsi > 50),
+            )
+
+        bb_masks = {}
+        for period in set(grid['bb_period']):
+            sma = _rolling_mean(close, period)
+            std_dev = _rolling_std(close, period)
+            for width in set(grid['bb_std']):
+                bb_masks[period, width] = (
+                    close < sma - std_dev * width,
+                    close > sma + std_dev * width,
+                )
+
+        atr_masks = {}
+        for period in set(grid['atr_period']):
+            atr = _rolling_mean(true_range, period)
+            for threshold in set(grid['atr_threshold']):
+                atr_masks[period, threshold] = atr > threshold
+
+    signals = np.zeros((len(combos), bars), dtype=np.int8)
+    for row, combo in zip(signals, combos):
+        rsi_buy, rsi_sell = rsi_masks[combo['rsi_period']]
+        bb_buy, bb_sell = bb_masks[combo['bb_period'], combo['bb_std']]
+        volatile = atr_masks[combo['atr_period'], combo['atr_threshold']]
+        row[bb_buy & rsi_buy & volatile] = 1
+        row[bb_sell & rsi_sell & volatile] = -1
+
+    return signals, combos
@@ -0,0 +1,175 @@
+"""
+Journal Module
+Append-only JSON Lines trade journal with rotation and compression
+"""
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+
+class TradeJournal:
+    """
+    One compact JSON object per line in log_dir/<prefix>_YYYY-MM-DD.jsonl
+    - the file stays open; write() serializes a batch and appends it with
+      one buffered write (flush() pushes it to the OS)
+    - the file rotates at midnight or once it passes max_bytes; rotated
+      parts are named <prefix>_YYYY-MM-DD.N.jsonl and gzipped by a
+      background thread
+    - read_journal() streams records back lazily, oldest first
+    Only one TradeJournal may write a given prefix in a directory: the
+    size count and rotation are per instance, so a second writer would
+    keep appending to a part this one has renamed and is compressing.
+    """
+
+    def __init__(self, log_dir="logs", prefix="trades", max_bytes=64 * 1024 * 1024,
+                 compress=True, buffer_size=1024 * 1024):
+        self.log_dir = log_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.file = None
+        self.date = None
+        self.size = 0
+        self.compressors = []
+        self.lock = threading.Lock()
+
+        os.makedirs(log_dir, exist_ok=True)
+        # Left over from an earlier run: finish compressing rotated parts
+        # and rotate live files of past days
+        today = datetime.now().strftime("%Y-%m-%d")
+        for name in sorted(os.listdir(log_dir)):
+            match = _PART.match(name)
+            if not match or match.group('prefix') != prefix or name.endswith('.gz'):
+                continue
+            if match.group('part'):
+                self._compress_later(os.path.join(log_dir, name))
+            elif match.group('date') < today:
+                self._rotate(os.path.join(log_dir, name), match.group('date'))
+
+    def path(self, date):
+        return os.path.join(self.log_dir, f"{self.prefix}_{date}.jsonl")
+
+    def write(self, records):
+        """Append records (dicts) as JSON lines"""
+        if not records:
+            return
+        data = "".join(json.dumps(record, separators=(',', ':'), default=str) + "\n"
+                       for record in records)
+        with self.lock:
+            self._roll(datetime.now().strftime("%Y-%m-%d"))
+            self.file.write(data)
+            self.size += len(data)
+
+    def flush(self):
+        with self.lock:
+            if self.file:
+                self.file.flush()
+
+    def close(self):
+        """Flush and fsync the current file, wait for pending compression"""
+        with self.lock:
+            if self.file:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
+        for thread in self.compressors:
+            thread.join()
+        self.compressors = []
+
+    def _roll(self, today):
+        """Open today's file; rotate on date change or size limit"""
+        if self.file is not None and self.date == today and self.size < self.max_bytes:
+            return
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self._rotate(self.path(self.date), self.date)
+
+        path = self.path(today)
+        if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            self._rotate(path, today)
+
+        self.date = today
+        self.file = open(path, 'a', buffering=self.buffer_size)
+        self.size = self.file.tell()
+
+    def _rotate(self, path, date):
+        """Rename a full file to its next part number and compress it"""
+        if not os.path.exists(path):
+            return
+        part = 1
+        while (os.path.exists(os.path.join(self.log_dir, f"{self.prefix}_{date}.{part}.jsonl"))
+               or os.path.exists(os.path.join(self.log_dir, f"{self.prefix}_{date}.{part}.jsonl.gz"))):
+            part += 1
+        rotated = os.path.join(self.log_dir, f"{self.prefix}_{date}.{part}.jsonl")
+        os.replace(path, rotated)
+        self._compress_later(rotated)
+
+    def _compress_later(self, path):
+        if not self.compress:
+            return
+        self.compressors = [t for t in self.compressors if t.is_alive()]
+        thread = threading.Thread(target=_gzip_file, args=(path,), name="journal-gzip", daemon=True)
+        thread.start()
+        self.compressors.append(thread)
+
+
+_PART = re.compile(r'^(?P<prefix>.+)_(?P<date>\d{4}-\d{2}-\d{2})(?:\.(?P<part>\d+))?\.jsonl(?:\.gz)?$')
+
+
+def _gzip_file(path):
+    """path -> path.gz, then remove the original"""
+    try:
+        with open(path, 'rb') as src, gzip.open(path + '.gz.tmp', 'wb') as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.replace(path + '.gz.tmp', path + '.gz')
+        os.remove(path)
+    except OSError as e:
+        print(f"⚠️  Journal compression failed ({path}): {e}")
+
+
+def journal_files(log_dir="logs", prefix="trades", start_date=None, end_date=None):
+    """Journal files, oldest first (start_date/end_date: inclusive YYYY-MM-DD)"""
+    files = []
+    for name in os.listdir(log_dir) if os.path.isdir(log_dir) else []:
+        match = _PART.match(name)
+        if not match or match.group('prefix') != prefix:
+            continue
+        date = match.group('date')
+        if (start_date and date < start_date) or (end_date and date > end_date):
+            continue
+        # Numbered parts come before the live file of the same day
+        part = int(match.group('part')) if match.group('part') else float('inf')
+        files.append((date, part, not name.endswith('.gz'), os.path.join(log_dir, name)))
+
+    # A part caught mid-compression exists twice; the .gz is complete
+    seen = set()
+    ordered = []
+    for date, part, _, path in sorted(files):
+        if (date, part) in seen:
+            continue
+        seen.add((date, part))
+        ordered.append(path)
+    return ordered
+
+
+def read_journal(log_dir="logs", prefix="trades", start_date=None, end_date=None):
+    """Yield journal records (dicts) lazily, oldest first"""
+    for path in journal_files(log_dir, prefix, start_date, end_date):
+        if not os.path.exists(path) and os.path.exists(path + '.gz'):
+            path += '.gz'  # compressed since it was listed
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
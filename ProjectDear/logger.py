@@ -2,154 +2,476 @@
 Logger Module
 Log all trades to file and database
 """
+import atexit
+import queue
+import re
 import sqlite3
-import json
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 import os
 
+from journal import TradeJournal
+
+
+INSERT_TRADE = """
+    INSERT INTO trades (timestamp, symbol, type, lot_size, entry_price, sl, tp, exit_price, profit, status, comment, account, ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Totals belong to the trades_daily_stats trigger; only the balance is set here
+UPSERT_DAILY_STATS = """
+    INSERT INTO daily_stats (date, total_trades, wins, losses, total_profit, balance)
+    VALUES (?, 0, 0, 0, 0, ?)
+    ON CONFLICT(date) DO UPDATE SET balance = excluded.balance
+"""
+
+
+def journal_prefix(account=None):
+    """Journal file prefix of a TradeLogger (one per account)"""
+    if account is None:
+        return "trades"
+    return "trades_" + re.sub(r'[^\w.-]', '_', str(account))
+
+
+def to_ts(timestamp):
+    """ISO timestamp (local time, as logged) -> epoch milliseconds"""
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp() * 1000)
+    return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+
+
+def _create_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            symbol TEXT,
+            type TEXT,
+            lot_size REAL,
+            entry_price REAL,
+            sl REAL,
+            tp REAL,
+            exit_price REAL,
+            profit REAL,
+            status TEXT,
+            comment TEXT
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            date TEXT PRIMARY KEY,
+            total_trades INTEGER,
+            wins INTEGER,
+            losses INTEGER,
+            total_profit REAL,
+            balance REAL
+        )
+    """)
+
+
+def _add_account(cursor):
+    # Databases from before versioning may already have it
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(trades)")]
+    if 'account' not in columns:
+        cursor.execute("ALTER TABLE trades ADD COLUMN account TEXT")
+
+
+def _add_ts(cursor):
+    # Sortable epoch-ms copy of timestamp, backfilled from existing rows
+    # (julianday 'utc' reads the naive text as local time, like to_ts)
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(trades)")]
+    if 'ts' not in columns:
+        cursor.execute("ALTER TABLE trades ADD COLUMN ts INTEGER")
+    cursor.execute("""
+        UPDATE trades
+        SET ts = CAST(ROUND((julianday(timestamp, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+        WHERE timestamp IS NOT NULL
+    """)
+
+
+def _add_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades (ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol_ts ON trades (symbol, ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades (status)")
+
+
+def _add_aggregates(cursor):
+    # Per day / symbol / account counters kept current by a trigger on
+    # every insert; daily_stats totals follow each close the same way
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trade_stats (
+            date TEXT,
+            symbol TEXT,
+            account TEXT NOT NULL DEFAULT '',
+            trades INTEGER,
+            wins INTEGER,
+            losses INTEGER,
+            profit REAL,
+            PRIMARY KEY (date, symbol, account)
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trades_aggregate AFTER INSERT ON trades
+        BEGIN
+            INSERT INTO trade_stats (date, symbol, account, trades, wins, losses, profit)
+            VALUES (substr(NEW.timestamp, 1, 10), NEW.symbol, COALESCE(NEW.account, ''), 1,
+                    NEW.status = 'WIN', NEW.status = 'LOSS', COALESCE(NEW.profit, 0))
+            ON CONFLICT (date, symbol, account) DO UPDATE SET
+                trades = trades + 1,
+                wins = wins + excluded.wins,
+                losses = losses + excluded.losses,
+                profit = profit + excluded.profit;
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trades_daily_stats AFTER INSERT ON trades
+        WHEN NEW.status IN ('WIN', 'LOSS')
+        BEGIN
+            INSERT INTO daily_stats (date, total_trades, wins, losses, total_profit, balance)
+            VALUES (substr(NEW.timestamp, 1, 10), 1, NEW.status = 'WIN', NEW.status = 'LOSS',
+                    COALESCE(NEW.profit, 0), 0)
+            ON CONFLICT (date) DO UPDATE SET
+                total_trades = total_trades + 1,
+                wins = wins + excluded.wins,
+                losses = losses + excluded.losses,
+                total_profit = total_profit + excluded.total_profit;
+        END
+    """)
+    
+    _rebuild_aggregates(cursor)
+
+
+def _rebuild_aggregates(cursor):
+    """Recompute trade_stats and the daily_stats totals from trades in one pass each"""
+    cursor.execute("DELETE FROM trade_stats")
+    cursor.execute("""
+        INSERT INTO trade_stats (date, symbol, account, trades, wins, losses, profit)
+        SELECT substr(timestamp, 1, 10), symbol, COALESCE(account, ''), COUNT(*),
+               SUM(status = 'WIN'), SUM(status = 'LOSS'), SUM(COALESCE(profit, 0))
+        FROM trades
+        WHERE timestamp IS NOT NULL
+        GROUP BY 1, 2, 3
+    """)
+    # Balance is left as set by update_daily_stats
+    cursor.execute("""
+        INSERT INTO daily_stats (date, total_trades, wins, losses, total_profit, balance)
+        SELECT date, SUM(wins + losses), SUM(wins), SUM(losses), SUM(profit), 0
+        FROM trade_stats
+        WHERE wins + losses > 0
+        GROUP BY date
+        ON CONFLICT (date) DO UPDATE SET
+            total_trades = excluded.total_trades,
+            wins = excluded.wins,
+            losses = excluded.losses,
+            total_profit = excluded.total_profit
+    """)
+
+
+# Schema versions: MIGRATIONS[n] upgrades a database from version n to n+1.
+# Columns are only ever appended, so tuple positions used by callers hold.
+MIGRATIONS = [
+    _create_tables,
+    _add_account,
+    _add_ts,
+    _add_indexes,
+    _add_aggregates,
+]
+
 
 class TradeLogger:
-    def __init__(self, db_path="trades.db", log_dir="logs"):
+    """
+    Trades and daily stats in SQLite (plus a JSON Lines journal in log_dir)
+    One long-lived connection in WAL mode. Writes are queued and a
+    background thread commits them in one transaction per flush_interval,
+    so log_trade only costs building the row (a malformed one raises in
+    the caller) and a queue put on the order path. The queue is
+    bounded (writers block when it is full), reads flush pending writes
+    first, and close() (also run at exit) drains the queue and checkpoints
+    the WAL. sync=True writes in the caller's thread instead (tests).
+    The schema is upgraded through MIGRATIONS on open; time filters use
+    half-open ranges on the indexed epoch-ms ts column.
+    """
+    
+    def __init__(self, db_path="trades.db", log_dir="logs", account=None,
+                 flush_interval=0.05, queue_size=10000, sync=False):
         self.db_path = db_path
         self.log_dir = log_dir
+        self.account = account  # tag for rows of this account (multi-account runs)
+        self.flush_interval = flush_interval
+        self.sync = sync
         
-        # Create logs directory
+        # Create logs directory; journal appends to logs/trades_YYYY-MM-DD.jsonl
+        # (logs/trades_<account>_YYYY-MM-DD.jsonl for a tagged account: a
+        # journal rotates its files on its own, so each writer needs a prefix)
         os.makedirs(log_dir, exist_ok=True)
+        self.journal = TradeJournal(log_dir, prefix=journal_prefix(account))
+        
+        # Long-lived connection shared by the writer thread and readers
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.Lock()
         
         # Initialize database
         self._init_db()
+        
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writer = None
+        if not sync:
+            self.writer = threading.Thread(target=self._write_loop, name="trade-logger", daemon=True)
+            self.writer.start()
+        atexit.register(self.close)
     
     def _init_db(self):
-        """Create trades table if not exists"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                symbol TEXT,
-                type TEXT,
-                lot_size REAL,
-                entry_price REAL,
-                sl REAL,
-                tp REAL,
-                exit_price REAL,
-                profit REAL,
-                status TEXT,
-                comment TEXT
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS daily_stats (
-                date TEXT PRIMARY KEY,
-                total_trades INTEGER,
-                wins INTEGER,
-                losses INTEGER,
-                total_profit REAL,
-                balance REAL
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        """Bring the schema up to date (versions tracked in PRAGMA user_version)"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            
+            # Each step and its version bump in one explicit transaction
+            # (sqlite3's implicit ones leave DDL outside), so a crash
+            # mid-migration leaves the previous version intact
+            isolation_level = self.conn.isolation_level
+            self.conn.isolation_level = None
+            try:
+                for target, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+                    cursor.execute("BEGIN")
+                    try:
+                        migrate(cursor)
+                        cursor.execute(f"PRAGMA user_version = {target}")
+                        cursor.execute("COMMIT")
+                    except Exception:
+                        cursor.execute("ROLLBACK")
+                        raise
+            finally:
+                self.conn.isolation_level = isolation_level
+            
+            # Aggregates lost (e.g. table emptied by hand): rebuild once
+            has_trades = cursor.execute("SELECT EXISTS (SELECT 1 FROM trades)").fetchone()[0]
+            has_stats = cursor.execute("SELECT EXISTS (SELECT 1 FROM trade_stats)").fetchone()[0]
+            if has_trades and not has_stats:
+                _rebuild_aggregates(cursor)
+                self.conn.commit()
     
     def log_trade(self, trade_data):
-        """Log trade to database and file"""
-        # Database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO trades (timestamp, symbol, type, lot_size, entry_price, sl, tp, exit_price, profit, status, comment)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            trade_data.get('timestamp', datetime.now().isoformat()),
-            trade_data.get('symbol'),
-            trade_data.get('type'),
-            trade_data.get('lot_size'),
-            trade_data.get('entry_price'),
-            trade_data.get('sl'),
-            trade_data.get('tp'),
-            trade_data.get('exit_price'),
-            trade_data.get('profit'),
-            trade_data.get('status'),
-            trade_data.get('comment', '')
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        # File log
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_file = os.path.join(self.log_dir, f"trades_{today}.log")
-        
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(trade_data, indent=2) + "\n")
+        """Log trade to database and file (a bad timestamp raises here)"""
+        self._enqueue(('trades', [self._trade_row(trade_data)], [trade_data]))
+    
+    def log_trades(self, trades, file_log=False):
+        """Bulk insert trades in one transaction (file log optional, off for backtests)"""
+        trades = list(trades)
+        if not trades:
+            return
+        rows = [self._trade_row(trade_data) for trade_data in trades]
+        self._enqueue(('trades', rows, trades if file_log else []))
     
     def update_daily_stats(self, date, stats):
-        """Update daily statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO daily_stats (date, total_trades, wins, losses, total_profit, balance)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            date,
-            stats.get('total_trades', 0),
-            stats.get('wins', 0),
-            stats.get('losses', 0),
-            stats.get('total_profit', 0),
-            stats.get('balance', 0)
-        ))
-        
-        conn.commit()
-        conn.close()
+        """Set the day's balance (trade totals are maintained from the trades table)"""
+        self._enqueue(('daily_stats', [(date, stats.get('balance', 0))], []))
     
     def get_today_trades(self):
-        """Get all trades from today"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        today = datetime.now().strftime("%Y-%m-%d")
-        cursor.execute("""
-            SELECT * FROM trades WHERE date(timestamp) = ?
-        """, (today,))
-        
-        trades = cursor.fetchall()
-        conn.close()
-        
-        return trades
+        """Get all trades from today (only this logger's account, if tagged)"""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.get_trades(today, today + timedelta(days=1), account=self.account)
+    
+    def get_trades(self, start=None, end=None, symbol=None, account=None):
+        """
+        Trades with start <= timestamp < end (datetimes or ISO strings),
+        optionally for one symbol / account. Uses the ts indexes.
+        """
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append("ts >= ?")
+            params.append(to_ts(start))
+        if end is not None:
+            conditions.append("ts < ?")
+            params.append(to_ts(end))
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if account is not None:
+            conditions.append("account = ?")
+            params.append(account)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query(f"SELECT * FROM trades {where} ORDER BY ts", params)
+    
+    def get_day_stats(self, date=None, symbol=None, account=None):
+        """
+        Running totals for one day (default today) from trade_stats:
+        {'trades', 'wins', 'losses', 'profit'}; trades counts every logged
+        row (opens and closes). Reads a handful of aggregate rows.
+        account defaults to this logger's account tag.
+        """
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        account = account if account is not None else self.account
+        conditions = ["date = ?"]
+        params = [date]
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if account is not None:
+            conditions.append("account = ?")
+            params.append(account)
+        row = self._query(f"""
+            SELECT COALESCE(SUM(trades), 0), COALESCE(SUM(wins), 0), COALESCE(SUM(losses), 0),
+                   COALESCE(SUM(profit), 0)
+            FROM trade_stats WHERE {' AND '.join(conditions)}
+        """, params)[0]
+        return {'trades': row[0], 'wins': row[1], 'losses': row[2], 'profit': row[3]}
+    
+    def rebuild_aggregates(self):
+        """Recompute trade_stats / daily_stats totals from the trades table"""
+        self.flush()
+        with self.lock:
+            _rebuild_aggregates(self.conn.cursor())
+            self.conn.commit()
     
     def get_stats(self, days=7):
         """Get statistics for last N days"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        return self._query("""
             SELECT * FROM daily_stats ORDER BY date DESC LIMIT ?
         """, (days,))
+    
+    def flush(self):
+        """Block until every write queued so far is committed"""
+        if self.writer is None or not self.writer.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Write everything still queued, checkpoint the WAL and close"""
+        if self.conn is None:
+            return
+        if self.writer is not None and self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+            self.conn = None
+        self.journal.close()
+        atexit.unregister(self.close)
+    
+    def _enqueue(self, item):
+        if self.writer is None:
+            self._write_batch([item])
+        else:
+            self.queue.put(item)
+    
+    def _query(self, sql, params):
+        self.flush()
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+    
+    def _write_loop(self):
+        """Collect queued writes for up to flush_interval, then commit them together"""
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while isinstance(batch[-1], tuple):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            # Markers (flush events / None = stop) end the batch early
+            marker = batch.pop() if not isinstance(batch[-1], tuple) else False
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"❌ Trade log write failed: {e}")
+            if marker is None:
+                return
+            if marker:
+                marker.set()
+    
+    def _write_batch(self, batch):
+        """
+        One transaction for the database, one journal write
+        Items are (kind, rows, journal records), applied in queue order.
+        If the transaction fails, the items are retried one at a time so a
+        bad item only loses its own rows.
+        """
+        try:
+            self._commit(batch)
+        except Exception:
+            if len(batch) == 1:
+                raise
+            written = []
+            for item in batch:
+                try:
+                    self._commit([item])
+                    written.append(item)
+                except Exception as e:
+                    print(f"❌ Trade log write failed, {len(item[1])} row(s) dropped: {e}")
+            batch = written
         
-        stats = cursor.fetchall()
-        conn.close()
+        # Journal (one buffered write per batch)
+        file_rows = [record for _, _, records in batch for record in records]
+        if file_rows:
+            self.journal.write(file_rows)
+            self.journal.flush()
+    
+    def _commit(self, items):
+        """Consecutive items of the same kind share one executemany"""
+        runs = []
+        for kind, rows, _ in items:
+            if runs and runs[-1][0] == kind:
+                runs[-1][1].extend(rows)
+            else:
+                runs.append((kind, list(rows)))
         
-        return stats
+        with self.lock:
+            try:
+                for kind, rows in runs:
+                    sql = UPSERT_DAILY_STATS if kind == 'daily_stats' else INSERT_TRADE
+                    self.conn.executemany(sql, rows)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+    
+    def _trade_row(self, trade_data):
+        timestamp = trade_data.get('timestamp') or datetime.now().isoformat()
+        return (
+            timestamp,
+            trade_data.get('symbol'),
+            trade_data.get('type'),
+            trade_data.get('lot_size'),
+            trade_data.get('entry_price'),
+            trade_data.get('sl'),
+            trade_data.get('tp'),
+            trade_data.get('exit_price'),
+            trade_data.get('profit'),
+            trade_data.get('status'),
+            trade_data.get('comment', ''),
+            trade_data.get('account', self.account),
+            to_ts(timestamp)
+        )
     
     def print_summary(self):
         """Print trading summary"""
-        today_trades = self.get_today_trades()
+        today = self.get_day_stats()
         
         print("\n" + "="*50)
-        print("📊 TRADING SUMMARY")
+        print("📊 TRADING SUMMARY" + (f" ({self.account})" if self.account else ""))
         print("="*50)
-        print(f"Today's trades: {len(today_trades)}")
+        print(f"Today's trades: {today['trades']}")
         
-        if today_trades:
-            wins = sum(1 for t in today_trades if t[9] == 'WIN')  # status column
-            losses = sum(1 for t in today_trades if t[9] == 'LOSS')
-            total_profit = sum(t[8] or 0 for t in today_trades)  # profit column
+        if today['trades']:
+            wins = today['wins']
+            losses = today['losses']
+            total_profit = today['profit']
             
             print(f"Wins: {wins} | Losses: {losses}")
             print(f"Win rate: {(wins/(wins+losses)*100):.1f}%" if (wins+losses) > 0 else "N/A")
@@ -0,0 +1,226 @@
+"""
+Multi-Account Bot
+One signal computation fanned out to several accounts at once
+"""
+import copy
+import json
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bot import signal_handler
+from broker import create_broker
+from execution import ExecutionPipeline
+from logger import TradeLogger
+from position_manager import PositionManager
+from profiler import CycleProfiler
+from scheduler import BarScheduler
+from signal_cache import SignalCache
+from symbol_settings import symbol_config
+
+
+def account_config(config, account):
+    """
+    Config for one entry of config['accounts']: its keys override
+    config['mt5'] (login, password, server, path, backend, silicon);
+    risk_percent overrides the strategy's
+    """
+    merged = copy.deepcopy(config)
+    merged['mt5'].update({k: v for k, v in account.items() if k not in ('name', 'risk_percent')})
+    if 'risk_percent' in account:
+        merged['strategy']['risk_percent'] = account['risk_percent']
+    return merged
+
+
+class AccountRunner:
+    """One account: own broker connection, limits, risk sizing and log rows"""
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.broker = create_broker(config)
+        self.logger = TradeLogger(account=name)
+        self.execution = ExecutionPipeline(self.broker, workers=2)
+        self.positions = PositionManager(self.broker, self.logger, self.execution, config)
+
+        self.has_open_positions = False
+        self.trades_today = 0
+        self.consecutive_losses = 0
+        self.daily_profit = 0.0
+
+    def can_trade(self):
+        strategy = self.config['strategy']
+        if self.trades_today >= strategy['max_trades_per_day']:
+            print(f"⏸️  [{self.name}] Max trades reached today ({self.trades_today})")
+            return False
+        if self.consecutive_losses >= strategy['max_consecutive_losses']:
+            print(f"⏸️  [{self.name}] Max consecutive losses ({self.consecutive_losses}). Stopped for today.")
+            return False
+        return True
+
+    def run(self, symbol, latest):
+        """
+        Manage this account's positions and trade the shared signal
+        Returns: order_send result of a new trade, or None
+        """
+        tick, positions, account_info = self.broker.snapshot(symbol)
+        self.has_open_positions = len(positions) > 0
+
+        for position, reason in self.positions.manage(positions, {symbol: latest}, {symbol: tick}):
+            self._record_closed_trade(position)
+
+        if latest['signal'] == 0 or positions or not self.can_trade():
+            return None
+
+        order_type = "BUY" if latest['signal'] == 1 else "SELL"
+        strategy = self.config['strategy']
+        lot_size = self.broker.calculate_lot_size(
+            symbol, strategy['risk_percent'], strategy['stop_loss_pips'],
+            balance=account_info.balance if account_info else None)
+
+        result = self.execution.submit_order(symbol, order_type, lot_size,
+                                             strategy['stop_loss_pips'], strategy['take_profit_pips'],
+                                             comment=f"Scalp_{order_type}").result()
+        if not result:
+            return None
+
+        self.trades_today += 1
+        self.logger.log_trade({
+            'timestamp': datetime.now().isoformat(),
+            'symbol': symbol,
+            'type': order_type,
+            'lot_size': lot_size,
+            'entry_price': result.price,
+            'sl': result.request.sl,
+            'tp': result.request.tp,
+            'exit_price': None,
+            'profit': None,
+            'status': 'OPEN',
+            'comment': f"RSI: {latest['rsi']:.2f}, ATR: {latest['atr']:.2f}",
+            'account': self.name
+        })
+        print(f"💰 [{self.name}] Trade #{self.trades_today}: {order_type} {lot_size} @ {result.price:.2f}")
+        return result
+
+    def _record_closed_trade(self, position):
+        profit = position.profit
+        self.daily_profit += profit
+        if profit > 0:
+            self.consecutive_losses = 0
+            print(f"✅ [{self.name}] WIN: ${profit:.2f}")
+        else:
+            self.consecutive_losses += 1
+            print(f"❌ [{self.name}] LOSS: ${profit:.2f} (consecutive: {self.consecutive_losses})")
+
+    def stop(self):
+        self.execution.stop()
+        self.logger.print_summary()
+        self.logger.close()
+        self.broker.disconnect()
+
+
+class MultiAccountBot:
+    """
+    Same strategy as GoldScalpingBot on every account in config['accounts']
+    Market data comes from the first account and signals are computed
+    once per cycle; each account then checks its positions and sends its
+    own order in parallel, so a cycle costs about one order's latency.
+    Native MetaTrader5 drives a single terminal per process, so more than
+    one account needs the Silicon backend (one bridge port per account).
+    """
+
+    def __init__(self, config_path="config.json"):
+        with open(config_path, 'r') as f:
+            self.config = json.load(f)
+
+        entries = self.config.get('accounts', [])
+        if not entries:
+            raise ValueError("config['accounts'] is empty (use bot.py for a single account)")
+        configs = [account_config(self.config, entry) for entry in entries]
+        if sum(1 for c in configs if c['mt5'].get('backend', 'native') == 'native') > 1:
+            raise ValueError("native MetaTrader5 supports one account per process; "
+                             "set backend to \"silicon\" with one port per account")
+
+        self.accounts = [AccountRunner(entry.get('name', str(entry.get('login'))), c)
+                         for entry, c in zip(entries, configs)]
+        self.data_broker = self.accounts[0].broker
+        self.signal_cache = SignalCache()
+        self.profiler = CycleProfiler(self.config)
+        self.pool = ThreadPoolExecutor(max_workers=len(self.accounts), thread_name_prefix="account")
+
+        symbol = self.config['strategy']['symbol']
+        self.scheduler = BarScheduler(
+            self.config,
+            [self.config['strategy']['timeframe']],
+            on_bar_close=lambda closed: self.run_cycle(),
+            on_tick=lambda tick: self.run_cycle(),
+            tick_source=lambda: self.data_broker.get_tick(symbol),
+            has_positions=lambda: any(a.has_open_positions for a in self.accounts)
+        )
+
+        print(f"🤖 Multi-account bot initialized ({len(self.accounts)} accounts)")
+        for account in self.accounts:
+            print(f"   {account.name}: risk {account.config['strategy']['risk_percent']}% per trade")
+
+    def start(self):
+        """Connect every account, then run the scheduler"""
+        connected = list(self.pool.map(lambda a: a.broker.connect(), self.accounts))
+        if not all(connected):
+            print("❌ Cannot connect all accounts. Exiting.")
+            return
+
+        print("\n🚀 Bot started! Monitoring market...\n")
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            print("\n⚠️  Bot stopped by user")
+        finally:
+            self.stop()
+
+    def run_cycle(self):
+        """Single trading cycle: one signal, all accounts in parallel"""
+        with self.profiler.stage('cycle'):
+            self._run_cycle()
+        self.profiler.maybe_dump()
+
+    def _run_cycle(self):
+        if not self.scheduler.in_session(datetime.now().hour):
+            return
+
+        symbol = self.config['strategy']['symbol']
+        timeframe = self.config['strategy']['timeframe']
+        with self.profiler.stage('get_data'):
+            data = self.data_broker.get_rates(symbol, timeframe, bars=100)
+        if data is None or len(data) == 0:
+            print("⚠️  No data received")
+            return
+
+        with self.profiler.stage('generate_signals'):
+            latest = self.signal_cache.get(symbol, timeframe, data, symbol_config(self.config, symbol))
+
+        started = time.perf_counter()
+        list(self.pool.map(lambda account: account.run(symbol, latest), self.accounts))
+        self.profiler.record('fan_out', time.perf_counter() - started)
+
+    def stop(self):
+        """Stop the bot"""
+        self.scheduler.stop()
+        for account in self.accounts:
+            account.stop()
+        self.pool.shutdown(wait=True)
+        self.profiler.print_stats()
+        self.signal_cache.print_stats()
+        print("\n👋 Bot stopped. See you next time!\n")
+
+
+if __name__ == "__main__":
+    signal.signal(signal.SIGINT, signal_handler)
+
+    try:
+        bot = MultiAccountBot()
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    bot.start()
@@ -0,0 +1,95 @@
+"""
+Position Manager Module
+Batched exit handling: one tick per symbol, all exits decided at once,
+closes sent concurrently, one log write
+"""
+from datetime import datetime
+
+from symbol_settings import symbol_config
+
+
+class PositionManager:
+    """
+    Replaces the per-position close loop of run_cycle
+    - positions are grouped by symbol and exit rules applied to all of them
+    - one symbol_info_tick per symbol with exits, shared by its closes
+    - closes go through the ExecutionPipeline, so different symbols are
+      sent in parallel (same symbol stays serialized by the pipeline)
+    - all closed trades are written with a single log_trades call
+    """
+
+    def __init__(self, broker, logger, execution, config):
+        self.broker = broker
+        self.logger = logger
+        self.execution = execution
+        self.config = config
+
+    def exit_reason(self, position, market_data):
+        """Exit reason for one position, or None to keep it"""
+        # Emergency exit on RSI reversal (the symbol's own thresholds)
+        indicators = symbol_config(self.config, position.symbol)['indicators']
+        if position.type == 0:  # BUY position
+            if market_data['rsi'] > indicators['rsi_overbought']:
+                return "EMERGENCY_EXIT"
+        else:  # SELL position
+            if market_data['rsi'] < indicators['rsi_oversold']:
+                return "EMERGENCY_EXIT"
+        return None
+
+    def manage(self, positions, market_data, ticks=None):
+        """
+        Apply exit rules to all open positions
+        market_data: {symbol: latest indicator dict}; symbols without data
+        are left alone
+        ticks: optional {symbol: tick} already fetched this cycle
+        Returns: list of (position, reason) that were closed
+        """
+        exits = {}
+        for position in positions:
+            latest = market_data.get(position.symbol)
+            if latest is None:
+                continue
+            reason = self.exit_reason(position, latest)
+            if reason:
+                exits.setdefault(position.symbol, []).append((position, reason))
+
+        if not exits:
+            return []
+
+        # One tick snapshot per symbol, then every close queued at once
+        pending = []
+        for symbol, group in exits.items():
+            tick = (ticks or {}).get(symbol) or self.broker.get_tick(symbol)
+            for position, reason in group:
+                future = self.execution.submit_close(position, comment=f"Bot {reason}", tick=tick)
+                pending.append((position, reason, future))
+
+        closed = []
+        rows = []
+        now = datetime.now().isoformat()
+        for position, reason, future in pending:
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            if not result:
+                continue
+
+            print(f"🚨 Emergency close {position.symbol} #{position.ticket} ({reason})")
+            closed.append((position, reason))
+            rows.append({
+                'timestamp': now,
+                'symbol': position.symbol,
+                'type': 'BUY' if position.type == 0 else 'SELL',
+                'lot_size': position.volume,
+                'entry_price': position.price_open,
+                'sl': position.sl,
+                'tp': position.tp,
+                'exit_price': result.price or position.price_current,
+                'profit': position.profit,
+                'status': "WIN" if position.profit > 0 else "LOSS",
+                'comment': reason
+            })
+
+        self.logger.log_trades(rows, file_log=True)
+        return closed
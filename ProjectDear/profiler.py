@@ -0,0 +1,108 @@
+"""
+Profiler Module
+Per-stage latency of the trading cycle (get_data, signals, positions,
+lot size, order_send, logging) with rolling percentiles
+"""
+import time
+
+from execution import LatencyHistogram
+
+
+class _StageTimer:
+    """Reusable context manager for one stage (no allocation per use)"""
+
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class CycleProfiler:
+    """
+    Hot-path stage timings
+    - `with profiler.stage('get_data'):` or profiler.record(name, seconds)
+    - every stage feeds a lifetime histogram and a window histogram; the
+      window is printed and reset every dump_interval seconds (maybe_dump)
+    - print_stats() prints lifetime percentiles, e.g. on shutdown
+    Timings use perf_counter (monotonic); recording is a bisect and an
+    increment, the measured per-stage overhead is shown with the stats.
+    Settings come from config['profiling']: enabled, dump_interval.
+    """
+
+    def __init__(self, config):
+        settings = config.get('profiling', {})
+        self.enabled = settings.get('enabled', True)
+        self.dump_interval = settings.get('dump_interval', 300)
+        self.totals = {}
+        self.window = {}
+        self.timers = {}
+        self.last_dump = time.monotonic()
+        self.overhead = self._calibrate() if self.enabled else 0.0
+        self.totals.clear()
+        self.window.clear()
+
+    def stage(self, name):
+        """Context manager timing one stage"""
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = _StageTimer(self, name)
+        return timer
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        histogram = self.totals.get(name)
+        if histogram is None:
+            histogram = self.totals[name] = LatencyHistogram()
+            self.window[name] = LatencyHistogram()
+        histogram.record(seconds)
+        self.window[name].record(seconds)
+
+    def maybe_dump(self):
+        """Print and reset the window once dump_interval has passed"""
+        if not self.enabled or not self.dump_interval:
+            return
+        now = time.monotonic()
+        if now - self.last_dump < self.dump_interval:
+            return
+        self._print(f"last {now - self.last_dump:.0f}s", self.window)
+        self.window = {name: LatencyHistogram() for name in self.totals}
+        self.last_dump = now
+
+    def stats(self):
+        return {name: histogram.summary() for name, histogram in self.totals.items()}
+
+    def print_stats(self):
+        """Print lifetime percentiles per stage"""
+        if self.enabled:
+            self._print("session", self.totals)
+
+    def _print(self, label, histograms):
+        print(f"\n⏱️  Cycle stages ({label}, ms) | overhead {self.overhead*1e6:.2f} us/stage")
+        for name, histogram in histograms.items():
+            s = histogram.summary()
+            if s['count'] == 0:
+                continue
+            print(f"   {name:<18} n={s['count']:<6} mean {s['mean']*1000:8.3f} | p50 {s['p50']*1000:8.3f} | "
+                  f"p90 {s['p90']*1000:8.3f} | p99 {s['p99']*1000:8.3f} | max {s['max']*1000:8.3f}")
+
+    def _calibrate(self, rounds=2000):
+        """Cost of timing an empty stage (seconds)"""
+        timer = self.stage('_calibrate')
+        started = time.perf_counter()
+        for _ in range(rounds):
+            with timer:
+                pass
+        elapsed = time.perf_counter() - started
+        del self.timers['_calibrate']
+        return elapsed / rounds
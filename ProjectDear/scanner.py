@@ -0,0 +1,129 @@
+"""
+Scanner Module
+Evaluate signals across many symbols and timeframes in parallel
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from indicators import RatesSignalEngine
+from symbol_settings import symbol_config
+
+
+# Per-process engines (one per symbol), config set by the pool initializer
+_config = None
+_engines = {}
+
+
+def _init_worker(config):
+    global _config
+    _config = config
+    _engines.clear()
+
+
+def _engine_for(engines, config, symbol):
+    engine = engines.get(symbol)
+    if engine is None:
+        engine = engines[symbol] = RatesSignalEngine(symbol_config(config, symbol))
+    return engine
+
+
+def _evaluate(symbol, rates):
+    return _engine_for(_engines, _config, symbol).evaluate(rates)
+
+
+class MarketScanner:
+    """
+    Watch a list of symbols x timeframes within one cycle
+    Bar fetches run on a bounded thread pool (broker calls are I/O bound),
+    indicator math runs on a process pool as soon as each fetch lands.
+    Latest-bar values are the same as generate_signals (RatesSignalEngine),
+    with each symbol's thresholds from config['symbols'] (symbol_config).
+    """
+
+    def __init__(self, config, fetch_rates, fetch_workers=None, compute_workers=None):
+        """
+        fetch_rates: callable(symbol, timeframe, bars) -> MT5 rates array,
+        e.g. MT5Broker.get_rates. compute_workers=0 evaluates inline.
+        """
+        self.config = config
+        self.fetch_rates = fetch_rates
+
+        scanner = config.get('scanner', {})
+        self.symbols = scanner.get('symbols') or [config['strategy']['symbol']]
+        self.timeframes = scanner.get('timeframes') or [config['strategy']['timeframe']]
+        self.bars = scanner.get('bars', 100)
+        self.fetch_workers = fetch_workers or scanner.get('fetch_workers', 8)
+        if compute_workers is None:
+            compute_workers = scanner.get('compute_workers', os.cpu_count() or 1)
+        self.compute_workers = compute_workers
+
+        self._fetch_pool = None
+        self._compute_pool = None
+        self._engines = {}
+        self.last_scan_seconds = None
+
+    def start(self):
+        """Create worker pools"""
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        if self.compute_workers > 0:
+            self._compute_pool = ProcessPoolExecutor(
+                max_workers=self.compute_workers,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+
+        print(f"🔭 Scanner ready: {len(self.symbols)} symbols x {len(self.timeframes)} timeframes")
+
+    def shutdown(self):
+        """Stop worker pools"""
+        if self._fetch_pool:
+            self._fetch_pool.shutdown(wait=True)
+            self._fetch_pool = None
+        if self._compute_pool:
+            self._compute_pool.shutdown(wait=True)
+            self._compute_pool = None
+
+    def scan(self):
+        """
+        Fetch and evaluate every symbol x timeframe
+        Returns: list of latest-bar dicts (with 'symbol' and 'timeframe'),
+        in config order; pairs without data are skipped
+        """
+        if self._fetch_pool is None:
+            self.start()
+
+        started = time.monotonic()
+        pairs = [(symbol, tf) for symbol in self.symbols for tf in self.timeframes]
+        fetches = [
+            self._fetch_pool.submit(self.fetch_rates, symbol, tf, self.bars)
+            for symbol, tf in pairs
+        ]
+
+        # Hand each window to the compute pool as soon as it arrives
+        evaluations = []
+        for (symbol, tf), fetch in zip(pairs, fetches):
+            try:
+                rates = fetch.result()
+            except Exception as e:
+                print(f"⚠️  Fetch failed for {symbol} {tf}: {e}")
+                continue
+            if rates is None or len(rates) == 0:
+                continue
+            if self._compute_pool:
+                evaluations.append((symbol, tf, self._compute_pool.submit(_evaluate, symbol, rates)))
+            else:
+                engine = _engine_for(self._engines, self.config, symbol)
+                evaluations.append((symbol, tf, engine.evaluate(rates)))
+
+        results = []
+        for symbol, tf, evaluation in evaluations:
+            latest = evaluation.result() if self._compute_pool else evaluation
+            if latest is None:
+                continue
+            latest['symbol'] = symbol
+            latest['timeframe'] = tf
+            results.append(latest)
+
+        self.last_scan_seconds = time.monotonic() - started
+        return results
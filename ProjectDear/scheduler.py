@@ -0,0 +1,109 @@
+"""
+Scheduler Module
+Wake the bot at bar close, on tick changes while positions are open,
+and sleep through closed sessions
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from bar_aggregator import TIMEFRAME_SECONDS
+
+
+class BarScheduler:
+    """
+    Event-driven replacement for the fixed sleep() main loops
+    - on_bar_close(timeframes) runs right after each configured timeframe
+      closes a bar (plus close_delay so the broker has the new bar)
+    - on_tick(tick) runs when the polled tick changes, only while
+      has_positions() is true
+    - outside trading_hours nothing is polled until the session starts
+    Settings come from config['scheduler']: close_delay, tick_interval and
+    utc_offset_hours (broker server offset, aligns H4/D1 closes).
+    """
+
+    def __init__(self, config, timeframes, on_bar_close, on_tick=None,
+                 tick_source=None, has_positions=None):
+        settings = config.get('scheduler', {})
+        self.timeframes = list(timeframes)
+        self.on_bar_close = on_bar_close
+        self.on_tick = on_tick
+        self.tick_source = tick_source
+        self.has_positions = has_positions or (lambda: False)
+
+        self.close_delay = settings.get('close_delay', 1.0)
+        self.tick_interval = settings.get('tick_interval', 1.0)
+        self.utc_offset = settings.get('utc_offset_hours', 0) * 3600
+        self.start_hour = config['strategy']['trading_hours']['start']
+        self.end_hour = config['strategy']['trading_hours']['end']
+
+        self._stop = threading.Event()
+
+    def next_close(self, timeframe, now):
+        """Wall-clock time (epoch) at which the current bar's close is handled"""
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        shifted = now - self.close_delay
+        boundary = shifted - ((shifted + self.utc_offset) % seconds) + seconds
+        return boundary + self.close_delay
+
+    def in_session(self, hour):
+        """Same trading-hours rule as run_cycle (handles overnight sessions)"""
+        if self.start_hour < self.end_hour:
+            return self.start_hour <= hour < self.end_hour
+        return hour >= self.start_hour or hour < self.end_hour
+
+    def seconds_until_session(self, now):
+        """0 inside trading hours, else seconds until trading_hours.start"""
+        current = datetime.fromtimestamp(now)
+        if self.in_session(current.hour):
+            return 0.0
+        start = current.replace(hour=self.start_hour, minute=0, second=0, microsecond=0)
+        if start <= current:
+            start += timedelta(days=1)
+        return (start - current).total_seconds()
+
+    def run(self):
+        """Blocking loop until stop()"""
+        self._stop.clear()
+        now = time.time()
+        closes = {tf: self.next_close(tf, now) for tf in self.timeframes}
+        last_tick = None
+
+        # First cycle right away (state, open positions)
+        if self.seconds_until_session(now) == 0:
+            self.on_bar_close(self.timeframes)
+
+        while not self._stop.is_set():
+            now = time.time()
+
+            idle = self.seconds_until_session(now)
+            if idle > 0:
+                print(f"😴 Outside trading hours, sleeping {idle/3600:.1f}h")
+                self._stop.wait(idle)
+                now = time.time()
+                closes = {tf: self.next_close(tf, now) for tf in self.timeframes}
+                continue
+
+            due = [tf for tf, at in closes.items() if now >= at]
+            if due:
+                self.on_bar_close(due)
+                for tf in due:
+                    closes[tf] = self.next_close(tf, now)
+                continue
+
+            watching = self.on_tick is not None and self.has_positions()
+            wake = min(closes.values())
+            if watching:
+                wake = min(wake, now + self.tick_interval)
+            self._stop.wait(max(0.0, wake - now))
+
+            if watching and time.time() < min(closes.values()):
+                tick = self.tick_source()
+                key = (tick.time_msc, tick.bid, tick.ask) if tick else None
+                if key is not None and key != last_tick:
+                    last_tick = key
+                    self.on_tick(tick)
+
+    def stop(self):
+        """Wake and exit the loop"""
+        self._stop.set()
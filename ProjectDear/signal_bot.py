@@ -4,14 +4,15 @@ Gold Trading Signal Bot - Semi-Auto
 Analyzes market and sends signals via Telegram (no auto-execution)
 """
 import json
-import time
 import requests
 from datetime import datetime
 import signal
 import sys
 
 import pandas as pd
-from indicators import generate_signals
+from signal_cache import SignalCache
+from history_store import HistoryStore
+from scheduler import BarScheduler
 
 # Yahoo Finance for free market data
 import yfinance as yf
@@ -31,6 +32,19 @@ class SignalBot:
         self.running = False
         self.last_signal = None
         self.last_signal_time = None
+        self.signal_cache = SignalCache()
+        
+        # Wakes right after each bar closes; idle outside trading hours
+        self.scheduler = BarScheduler(
+            self.config,
+            [self.config['strategy']['timeframe']],
+            on_bar_close=lambda closed: self.check_market()
+        )
+        
+        # Optional local bar history (config: history.enabled)
+        self.history = None
+        if self.config.get('history', {}).get('enabled'):
+            self.history = HistoryStore(self.config['history'].get('path', 'history'))
         
         print("🤖 Gold Signal Bot initialized")
         print(f"   Symbol: {self.config['strategy']['symbol']}")
@@ -103,6 +117,9 @@ class SignalBot:
             data.reset_index(inplace=True)
             data.rename(columns={'Datetime': 'time'}, inplace=True)
             
+            if self.history:
+                self.history.append("GC=F", timeframe, data)
+            
             return data
         
         except Exception as e:
@@ -116,26 +133,14 @@ class SignalBot:
         if data is None or len(data) < 50:
             return None
         
-        # Generate signals
-        data = generate_signals(data, self.config)
-        
-        # Get latest bar
-        latest = data.iloc[-1]
+        # Generate signals (cached until a new bar closes)
+        latest = self.signal_cache.get(
+            "GC=F", self.config['strategy']['timeframe'], data, self.config)
         signal = latest['signal']
         
-        # Check trading hours
-        current_hour = datetime.now().hour
-        start_hour = self.config['strategy']['trading_hours']['start']
-        end_hour = self.config['strategy']['trading_hours']['end']
-        
-        in_trading_hours = False
-        if start_hour < end_hour:
-            in_trading_hours = start_hour <= current_hour < end_hour
-        else:
-            in_trading_hours = current_hour >= start_hour or current_hour < end_hour
-        
-        if not in_trading_hours:
-            signal = 0  # Override signal outside trading hours
+        # Direct calls outside the scheduler still respect trading hours
+        if not self.scheduler.in_session(datetime.now().hour):
+            signal = 0
         
         return {
             'signal': signal,
@@ -144,8 +149,7 @@ class SignalBot:
             'atr': latest['atr'],
             'bb_upper': latest['bb_upper'],
             'bb_lower': latest['bb_lower'],
-            'time': latest['time'],
-            'in_trading_hours': in_trading_hours
+            'time': latest['time']
         }
     
     def format_signal_message(self, analysis):
@@ -213,52 +217,50 @@ https://my.exness.com/webtrading/
         print("🚀 Bot started! Monitoring market...\n")
         
         try:
-            while self.running:
-                analysis = self.analyze_market()
-                
-                if analysis:
-                    signal = analysis['signal']
-                    
-                    # Only send if:
-                    # 1. New signal (different from last)
-                    # 2. At least 15 minutes since last signal
-                    time_since_last = None
-                    if self.last_signal_time:
-                        time_since_last = (datetime.now() - self.last_signal_time).total_seconds() / 60
-                    
-                    should_send = (
-                        signal != 0 and
-                        signal != self.last_signal and
-                        (time_since_last is None or time_since_last >= 15)
-                    )
-                    
-                    if should_send:
-                        message = self.format_signal_message(analysis)
-                        if message:
-                            self.send_telegram(message)
-                            self.last_signal = signal
-                            self.last_signal_time = datetime.now()
-                            print(f"📤 Signal sent: {'BUY' if signal == 1 else 'SELL'} at ${analysis['price']:.2f}")
-                    
-                    # Status update (console only)
-                    if not analysis['in_trading_hours']:
-                        print(f"⏸️  Outside trading hours | Price: ${analysis['price']:.2f} | RSI: {analysis['rsi']:.1f}")
-                    else:
-                        status = "🟢 BUY" if signal == 1 else "🔴 SELL" if signal == -1 else "⚪ HOLD"
-                        print(f"{status} | Price: ${analysis['price']:.2f} | RSI: {analysis['rsi']:.1f} | ATR: {analysis['atr']:.2f}")
-                
-                # Check every 1 minute
-                time.sleep(60)
-        
+            self.scheduler.run()
         except KeyboardInterrupt:
             print("\n⚠️  Bot stopped by user")
         finally:
             self.stop()
     
+    def check_market(self):
+        """Analyze the latest bar and send a signal if needed"""
+        analysis = self.analyze_market()
+        
+        if analysis:
+            signal = analysis['signal']
+            
+            # Only send if:
+            # 1. New signal (different from last)
+            # 2. At least 15 minutes since last signal
+            time_since_last = None
+            if self.last_signal_time:
+                time_since_last = (datetime.now() - self.last_signal_time).total_seconds() / 60
+            
+            should_send = (
+                signal != 0 and
+                signal != self.last_signal and
+                (time_since_last is None or time_since_last >= 15)
+            )
+            
+            if should_send:
+                message = self.format_signal_message(analysis)
+                if message:
+                    self.send_telegram(message)
+                    self.last_signal = signal
+                    self.last_signal_time = datetime.now()
+                    print(f"📤 Signal sent: {'BUY' if signal == 1 else 'SELL'} at ${analysis['price']:.2f}")
+            
+            # Status update (console only; the scheduler only calls in session)
+            status = "🟢 BUY" if signal == 1 else "🔴 SELL" if signal == -1 else "⚪ HOLD"
+            print(f"{status} | Price: ${analysis['price']:.2f} | RSI: {analysis['rsi']:.1f} | ATR: {analysis['atr']:.2f}")
+    
     def stop(self):
         """Stop the bot"""
         self.running = False
+        self.scheduler.stop()
         self.send_telegram("🛑 <b>Signal Bot Stopped</b>")
+        self.signal_cache.print_stats()
         print("\n👋 Bot stopped!\n")
 
 
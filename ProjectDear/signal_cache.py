@@ -0,0 +1,90 @@
+"""
+Signal Cache Module
+Reuse indicator state between cycles until a new bar closes
+"""
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from indicators import IncrementalIndicators
+
+
+def config_hash(config):
+    """Stable hash of the indicator settings"""
+    return hash(json.dumps(config['indicators'], sort_keys=True))
+
+
+class SignalCache:
+    """
+    LRU cache of indicator state per (symbol, timeframe, config)
+    An entry is valid while the last closed bar time is unchanged: a hit
+    only re-applies the forming bar (O(1)); a miss advances the entry
+    with the newly closed bars, or reseeds it from the window.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (symbol, timeframe, config hash) -> (closed time, engine)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol, timeframe, data, config):
+        """
+        Latest-bar indicators and signal for a window of bars
+        data: DataFrame or MT5 rates array, last row = forming bar
+        Returns: dict (see IncrementalIndicators.latest) or None
+        """
+        if data is None or len(data) == 0:
+            return None
+
+        times = np.asarray(data['time'])
+        closed_time = times[-2] if len(times) > 1 else None
+        stream = (symbol, timeframe, config_hash(config))
+
+        entry = self.entries.get(stream)
+        if entry is not None:
+            self.entries.move_to_end(stream)
+            cached_time, engine = entry
+            if cached_time == closed_time and engine.last_time == times[-1]:
+                # Closed history unchanged: only the forming bar is revised
+                self.hits += 1
+                return engine.sync(data[-1:] if _is_rates(data) else data.iloc[-1:])
+        else:
+            engine = IncrementalIndicators(config)
+
+        self.misses += 1
+        latest = engine.sync(data)
+        self.entries[stream] = (closed_time, engine)
+        self.entries.move_to_end(stream)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return latest
+
+    def invalidate(self, symbol=None, timeframe=None):
+        """Drop entries (all, or for one symbol / timeframe)"""
+        for stream in list(self.entries):
+            if symbol is not None and stream[0] != symbol:
+                continue
+            if timeframe is not None and stream[1] != timeframe:
+                continue
+            del self.entries[stream]
+
+    def stats(self):
+        """Hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.entries),
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"🗄️  Signal cache: {stats['hits']} hits / {stats['misses']} misses "
+              f"({stats['hit_rate']*100:.1f}% hit rate, {stats['entries']} entries)")
+
+
+def _is_rates(data):
+    return getattr(getattr(data, 'dtype', None), 'names', None) is not None
@@ -0,0 +1,413 @@
+"""
+Simulated MT5 Module
+In-process stand-in for the MetaTrader5 API over replayed or synthetic
+bars, for load testing the order path without a terminal
+
+Usage:
+    import sim_mt5
+    sim = sim_mt5.install(sim_mt5.SimulatedMT5(latency=0.0005, requote_rate=0.01))
+    from broker import MT5Broker   # now talks to the simulator
+"""
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from bar_aggregator import RATES_DTYPE
+
+
+# Same constant values as the MetaTrader5 package
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+ORDER_TIME_GTC = 0
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+COPY_TICKS_ALL = -1
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_PRICE_CHANGED = 10020
+TRADE_RETCODE_PRICE_OFF = 10021
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+TIMEFRAME_MINUTES = {
+    TIMEFRAME_M1: 1,
+    TIMEFRAME_M5: 5,
+    TIMEFRAME_M15: 15,
+    TIMEFRAME_M30: 30,
+    TIMEFRAME_H1: 60,
+    TIMEFRAME_H4: 240,
+    TIMEFRAME_D1: 1440,
+}
+
+TICKS_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+    ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+AccountInfo = namedtuple('AccountInfo', 'login name server currency leverage balance equity margin margin_free profit')
+SymbolInfo = namedtuple('SymbolInfo', 'name point digits spread volume_min volume_max volume_step trade_contract_size bid ask')
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+TradeRequest = namedtuple('TradeRequest', 'action symbol volume type price sl tp deviation magic comment type_time type_filling position')
+OrderSendResult = namedtuple('OrderSendResult', 'retcode deal order volume price bid ask comment request_id request')
+TradePosition = namedtuple('TradePosition', 'ticket time type magic volume price_open sl tp price_current profit symbol comment')
+
+
+def synthetic_rates(bars=20000, start_price=2000.0, seed=0, start_time=1_700_000_000):
+    """Random-walk M1 bars"""
+    rng = np.random.default_rng(seed)
+    close = start_price + np.cumsum(rng.normal(0, 0.4, bars))
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates['time'] = start_time - start_time % 60 + np.arange(bars) * 60
+    rates['open'] = np.r_[close[0], close[:-1]]
+    rates['close'] = close
+    rates['high'] = np.maximum(rates['open'], close) + rng.random(bars) * 0.5
+    rates['low'] = np.minimum(rates['open'], close) - rng.random(bars) * 0.5
+    rates['tick_volume'] = rng.integers(20, 400, bars)
+    return rates
+
+
+def _aggregate(rates, minutes):
+    """M1 bars -> higher timeframe bars (aligned on epoch multiples)"""
+    if minutes == 1:
+        return rates
+    keys = rates['time'] - rates['time'] % (minutes * 60)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(rates)] - 1
+    out = np.zeros(len(starts), dtype=RATES_DTYPE)
+    out['time'] = keys[starts]
+    out['open'] = rates['open'][starts]
+    out['close'] = rates['close'][ends]
+    out['high'] = np.maximum.reduceat(rates['high'], starts)
+    out['low'] = np.minimum.reduceat(rates['low'], starts)
+    out['tick_volume'] = np.add.reduceat(rates['tick_volume'], starts)
+    out['real_volume'] = np.add.reduceat(rates['real_volume'], starts)
+    return out
+
+
+class SimulatedMT5:
+    """
+    Subset of the MetaTrader5 module API used by broker.py / bot*.py
+    Market state is one M1 cursor shared by all symbols; advance() moves
+    it forward and triggers SL/TP. order_send fills at the current
+    bid/ask, with optional latency, random requotes and deviation checks.
+    Thread-safe, and cheap enough for tens of thousands of orders/second.
+    """
+
+    def __init__(self, rates=None, balance=300.0, latency=0.0, requote_rate=0.0,
+                 spread_points=20, point=0.01, contract_size=100, seed=0):
+        self.latency = latency
+        self.requote_rate = requote_rate
+        self.spread_points = spread_points
+        self.point = point
+        self.contract_size = contract_size
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.RLock()
+
+        self.rates = {}  # symbol -> M1 rates
+        self.aggregated = {}  # (symbol, minutes) -> rates
+        for symbol, symbol_rates in (rates or {}).items():
+            self.load_rates(symbol, symbol_rates)
+        self.cursor = 100  # index of the forming M1 bar
+
+        self.balance = float(balance)
+        self.positions = {}  # ticket -> dict
+        self.next_ticket = 1
+        self.orders_sent = 0
+        self.requotes = 0
+        self.connected = False
+
+        # Expose constants like the real module
+        for name, value in globals().items():
+            if name.isupper() and isinstance(value, int):
+                setattr(self, name, value)
+
+    def load_rates(self, symbol, rates):
+        """Replay these M1 bars for symbol"""
+        with self.lock:
+            self.rates[symbol] = np.asarray(rates, dtype=RATES_DTYPE)
+            for key in [k for k in self.aggregated if k[0] == symbol]:
+                del self.aggregated[key]
+
+    def _symbol_rates(self, symbol):
+        if symbol not in self.rates:
+            seed = sum(symbol.encode())
+            self.load_rates(symbol, synthetic_rates(seed=seed))
+        return self.rates[symbol]
+
+    def advance(self, bars=1):
+        """Move market time forward by M1 bars, triggering SL/TP"""
+        with self.lock:
+            for _ in range(bars):
+                self.cursor += 1
+                self._check_stops()
+
+    def _bar(self, symbol):
+        rates = self._symbol_rates(symbol)
+        return rates[min(self.cursor, len(rates) - 1)]
+
+    def _prices(self, symbol):
+        bid = float(self._bar(symbol)['close'])
+        return bid, bid + self.spread_points * self.point
+
+    def _delay(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def initialize(self, *args, **kwargs):
+        self._delay()
+        self.connected = True
+        return True
+
+    def login(self, *args, **kwargs):
+        return self.initialize()
+
+    def ping(self):
+        return True
+
+    def shutdown(self):
+        self.connected = False
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def account_info(self):
+        self._delay()
+        with self.lock:
+            floating = sum(self._position_profit(p) for p in self.positions.values())
+            margin = sum(p['volume'] * self.contract_size * p['price_open'] / 100 for p in self.positions.values())
+            equity = self.balance + floating
+            return AccountInfo(12345678, 'Simulator', 'Sim-Server', 'USD', 100,
+                               self.balance, equity, margin, equity - margin, floating)
+
+    def symbol_info(self, symbol):
+        self._delay()
+        with self.lock:
+            bid, ask = self._prices(symbol)
+        return SymbolInfo(symbol, self.point, 2, self.spread_points, 0.01, 100.0, 0.01,
+                          self.contract_size, bid, ask)
+
+    def symbol_info_tick(self, symbol):
+        self._delay()
+        with self.lock:
+            bid, ask = self._prices(symbol)
+            t = int(self._bar(symbol)['time'])
+        return Tick(t, bid, ask, 0.0, 0, t * 1000, 0, 0.0)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        """Bars ending start_pos bars before the forming one (0 = forming bar last)"""
+        self._delay()
+        with self.lock:
+            minutes = TIMEFRAME_MINUTES.get(timeframe, 1)
+            m1 = self._symbol_rates(symbol)
+            cursor = min(self.cursor, len(m1) - 1)
+            bars = self._timeframe_rates(symbol, minutes)
+
+            now = m1['time'][cursor]
+            current = int(np.searchsorted(bars['time'], now - now % (minutes * 60)))
+            end = current + 1 - start_pos
+            if end <= 0:
+                return None
+            out = bars[max(0, end - count):end].copy()
+
+            if start_pos == 0 and minutes > 1:
+                # Forming bar only contains M1 bars up to the cursor
+                first = int(np.searchsorted(m1['time'], out['time'][-1]))
+                part = m1[first:cursor + 1]
+                out['high'][-1] = part['high'].max()
+                out['low'][-1] = part['low'].min()
+                out['close'][-1] = part['close'][-1]
+                out['tick_volume'][-1] = part['tick_volume'].sum()
+            return out
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        """count bars ending at date_from (epoch seconds or datetime)"""
+        self._delay()
+        with self.lock:
+            minutes = TIMEFRAME_MINUTES.get(timeframe, 1)
+            bars = self._timeframe_rates(symbol, minutes)
+            m1 = self._symbol_rates(symbol)
+            limit = min(_epoch(date_from), int(m1['time'][min(self.cursor, len(m1) - 1)]))
+            end = int(np.searchsorted(bars['time'], limit, side='right'))
+            return bars[max(0, end - count):end].copy()
+
+    def copy_ticks_from(self, symbol, date_from, count, flags=COPY_TICKS_ALL):
+        """One tick per M1 close from date_from up to the cursor"""
+        self._delay()
+        with self.lock:
+            m1 = self._symbol_rates(symbol)
+            start = int(np.searchsorted(m1['time'], _epoch(date_from)))
+            end = min(self.cursor + 1, len(m1), start + count)
+            bars = m1[start:end]
+            ticks = np.zeros(len(bars), dtype=TICKS_DTYPE)
+            ticks['time'] = bars['time']
+            ticks['bid'] = bars['close']
+            ticks['ask'] = bars['close'] + self.spread_points * self.point
+            ticks['time_msc'] = bars['time'] * 1000
+            ticks['volume'] = 1
+            return ticks
+
+    def _timeframe_rates(self, symbol, minutes):
+        key = (symbol, minutes)
+        if key not in self.aggregated:
+            self.aggregated[key] = _aggregate(self._symbol_rates(symbol), minutes)
+        return self.aggregated[key]
+
+    def order_send(self, request):
+        self._delay()
+        request = TradeRequest(**{field: request.get(field, 0) for field in TradeRequest._fields})
+        with self.lock:
+            self.orders_sent += 1
+            bid, ask = self._prices(request.symbol)
+
+            if request.position:
+                position = self.positions.get(request.position)
+                if position is None:
+                    return self._result(TRADE_RETCODE_POSITION_CLOSED, request, 0.0, bid, ask, "Position closed")
+            if request.volume <= 0:
+                return self._result(TRADE_RETCODE_INVALID_VOLUME, request, 0.0, bid, ask, "Invalid volume")
+
+            price = ask if request.type == ORDER_TYPE_BUY else bid
+            deviation = (request.deviation or 0) * self.point
+            if request.price and abs(request.price - price) > deviation:
+                self.requotes += 1
+                return self._result(TRADE_RETCODE_REQUOTE, request, price, bid, ask, "Requote")
+            if self.requote_rate and self.rng.random() < self.requote_rate:
+                self.requotes += 1
+                return self._result(TRADE_RETCODE_REQUOTE, request, price, bid, ask, "Requote")
+
+            ticket = self.next_ticket
+            self.next_ticket += 1
+
+            if request.position:
+                self._close(request.position, price)
+                return self._result(TRADE_RETCODE_DONE, request, price, bid, ask, "Request executed", ticket)
+
+            self.positions[ticket] = {
+                'ticket': ticket,
+                'time': int(self._bar(request.symbol)['time']),
+                'type': request.type,
+                'magic': request.magic,
+                'volume': request.volume,
+                'price_open': price,
+                'sl': request.sl,
+                'tp': request.tp,
+                'symbol': request.symbol,
+                'comment': request.comment,
+            }
+            return self._result(TRADE_RETCODE_DONE, request, price, bid, ask, "Request executed", ticket)
+
+    def positions_get(self, symbol=None, ticket=None):
+        self._delay()
+        with self.lock:
+            positions = [
+                self._position_tuple(p) for p in self.positions.values()
+                if (symbol is None or p['symbol'] == symbol) and (ticket is None or p['ticket'] == ticket)
+            ]
+        return tuple(positions)
+
+    def positions_total(self):
+        return len(self.positions)
+
+    def _result(self, retcode, request, price, bid, ask, comment, ticket=0):
+        return OrderSendResult(retcode, ticket, ticket, request.volume if ticket else 0.0,
+                               price, bid, ask, comment, 0, request)
+
+    def _position_profit(self, p):
+        bid, ask = self._prices(p['symbol'])
+        if p['type'] == ORDER_TYPE_BUY:
+            return (bid - p['price_open']) * p['volume'] * self.contract_size
+        return (p['price_open'] - ask) * p['volume'] * self.contract_size
+
+    def _position_tuple(self, p):
+        bid, ask = self._prices(p['symbol'])
+        current = bid if p['type'] == ORDER_TYPE_BUY else ask
+        return TradePosition(p['ticket'], p['time'], p['type'], p['magic'], p['volume'],
+                             p['price_open'], p['sl'], p['tp'], current,
+                             self._position_profit(p), p['symbol'], p['comment'])
+
+    def _close(self, ticket, price):
+        p = self.positions.pop(ticket)
+        direction = 1 if p['type'] == ORDER_TYPE_BUY else -1
+        self.balance += (price - p['price_open']) * direction * p['volume'] * self.contract_size
+
+    def _check_stops(self):
+        for ticket, p in list(self.positions.items()):
+            bar = self._bar(p['symbol'])
+            spread = self.spread_points * self.point
+            if p['type'] == ORDER_TYPE_BUY:
+                if p['sl'] and bar['low'] <= p['sl']:
+                    self._close(ticket, p['sl'])
+                elif p['tp'] and bar['high'] >= p['tp']:
+                    self._close(ticket, p['tp'])
+            else:
+                if p['sl'] and bar['high'] + spread >= p['sl']:
+                    self._close(ticket, p['sl'])
+                elif p['tp'] and bar['low'] + spread <= p['tp']:
+                    self._close(ticket, p['tp'])
+
+
+def _epoch(value):
+    if hasattr(value, 'timestamp'):
+        return int(value.timestamp())
+    return int(value)
+
+
+def install(sim=None):
+    """
+    Register a simulator as the MetaTrader5 and siliconmetatrader5 modules
+    Call before importing broker / bot / bot_silicon.
+    """
+    sim = sim or SimulatedMT5()
+    silicon = type(sys)('siliconmetatrader5')
+    silicon.MetaTrader5 = lambda *args, **kwargs: sim
+    sys.modules['MetaTrader5'] = sim
+    sys.modules['siliconmetatrader5'] = silicon
+    return sim
+
+
+def load_test(orders=20000, latency=0.0, requote_rate=0.0):
+    """Open/close orders through MT5Broker and report throughput and latency"""
+    sim = install(SimulatedMT5(latency=latency, requote_rate=requote_rate))
+
+    import io
+    import contextlib
+    from broker import MT5Broker
+
+    broker = MT5Broker({'mt5': {'login': 0, 'password': '', 'server': 'Sim'}})
+    with contextlib.redirect_stdout(io.StringIO()):
+        broker.connect()
+
+    latencies = np.empty(orders)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(orders):
+            t0 = time.perf_counter()
+            result = broker.place_order("XAUUSD", "BUY" if i % 2 == 0 else "SELL", 0.01, 15, 30)
+            if result:
+                broker.close_position(sim.positions_get(ticket=result.order)[0])
+            latencies[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+
+    print(f"🧪 {orders} open+close round trips in {elapsed:.2f}s "
+          f"({sim.orders_sent / elapsed:,.0f} order_send/s, {sim.requotes} requotes)")
+    print(f"   latency p50 {np.percentile(latencies, 50)*1e6:.0f}us | "
+          f"p99 {np.percentile(latencies, 99)*1e6:.0f}us | max {latencies.max()*1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    load_test(orders=int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
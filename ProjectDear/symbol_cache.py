@@ -0,0 +1,62 @@
+"""
+Symbol Cache Module
+Cache symbol specs (point, lot limits, contract size) between trades
+"""
+import time
+from collections import namedtuple
+
+
+SymbolSpec = namedtuple('SymbolSpec', [
+    'name',
+    'point',
+    'digits',
+    'volume_step',
+    'volume_min',
+    'volume_max',
+    'trade_contract_size',
+])
+
+
+class SymbolCache:
+    """
+    Symbol specs loaded once per symbol through symbol_info
+    Entries expire after ttl seconds; invalidate() forces a reload.
+    Specs only change on broker-side edits, so this takes symbol_info
+    off the order path (a network round trip on the Silicon bridge).
+    """
+
+    def __init__(self, symbol_info, ttl=3600):
+        """symbol_info: callable(symbol), e.g. mt5.symbol_info"""
+        self.symbol_info = symbol_info
+        self.ttl = ttl
+        self.specs = {}  # symbol -> (loaded at, SymbolSpec)
+
+    def get(self, symbol):
+        """Spec for symbol, or None if the broker does not know it"""
+        entry = self.specs.get(symbol)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+
+        info = self.symbol_info(symbol)
+        if not info:
+            return None
+
+        spec = SymbolSpec(
+            name=symbol,
+            point=info.point,
+            digits=info.digits,
+            volume_step=info.volume_step,
+            volume_min=info.volume_min,
+            volume_max=info.volume_max,
+            trade_contract_size=info.trade_contract_size,
+        )
+        self.specs[symbol] = (now, spec)
+        return spec
+
+    def invalidate(self, symbol=None):
+        """Drop one symbol (or all) so the next get() reloads it"""
+        if symbol is None:
+            self.specs.clear()
+        else:
+            self.specs.pop(symbol, None)
@@ -0,0 +1,27 @@
+"""
+Symbol Settings Module
+Per-symbol overrides of the gold-tuned strategy settings
+"""
+
+
+def symbol_config(config, symbol):
+    """
+    Config for trading one symbol: config['symbols'][symbol] overrides
+    the indicator thresholds (indicators: {...}) and the pip value
+    (pip_value: account currency per pip per 0.01 lot; default
+    strategy.pip_value, else the XAUUSD 0.01). Symbols without an entry
+    get the top-level settings unchanged.
+    """
+    overrides = config.get('symbols', {}).get(symbol)
+    if not overrides:
+        return config
+    merged = dict(config)
+    merged['indicators'] = {**config['indicators'], **overrides.get('indicators', {})}
+    if 'pip_value' in overrides:
+        merged['strategy'] = {**config['strategy'], 'pip_value': overrides['pip_value']}
+    return merged
+
+
+def pip_value(config, symbol):
+    """Account currency per pip per 0.01 lot for symbol"""
+    return symbol_config(config, symbol)['strategy'].get('pip_value', 0.01)
@@ -0,0 +1,82 @@
+"""
+TradeAnalytics: a ts index must drive every scan so rows stream in time
+order without a temp sort, and local days/hours follow DST changes
+Run: python -m pytest test_analytics.py
+"""
+import time
+
+import numpy as np
+import pytest
+
+from analytics import TradeAnalytics
+from logger import TradeLogger
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    logger = TradeLogger(db_path=str(tmp_path / "trades.db"), log_dir=str(tmp_path / "logs"), sync=True)
+    logger.log_trades([
+        {'timestamp': f"2024-01-{day:02d}T10:00:00", 'symbol': symbol, 'status': status,
+         'profit': 1.0 if status == 'WIN' else -1.0}
+        for day in range(1, 29)
+        for symbol in ('XAUUSD', 'EURUSD')
+        for status in ('OPEN', 'WIN', 'LOSS')
+    ])
+    logger.close()
+    analytics = TradeAnalytics(str(tmp_path / "trades.db"))
+    yield analytics
+    analytics.close()
+
+
+def query_plan(analytics, **filters):
+    sql, params = analytics._select("ts, profit", filters.get('start'), filters.get('end'),
+                                    filters.get('symbol'), filters.get('account'))
+    rows = analytics.conn.execute("EXPLAIN QUERY PLAN " + sql + " ORDER BY ts", params).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("filters, index", [
+    ({}, "idx_trades_ts"),
+    ({'start': "2024-01-05", 'end': "2024-01-20"}, "idx_trades_ts"),
+    ({'account': "demo"}, "idx_trades_ts"),
+    ({'start': "2024-01-05", 'end': "2024-01-20", 'symbol': "XAUUSD"}, "idx_trades_symbol_ts"),
+])
+def test_ts_index_drives_query(analytics, filters, index):
+    plan = query_plan(analytics, **filters)
+    assert f"USING INDEX {index} " in plan
+    assert "idx_trades_status" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_results_in_time_order(analytics):
+    trades = analytics.load(start="2024-01-05", end="2024-01-20", symbol="XAUUSD")
+    assert len(trades) == 2 * 15
+    assert (trades['ts'][1:] >= trades['ts'][:-1]).all()
+    assert analytics.metrics()['trades'] == 2 * 2 * 28
+
+
+@pytest.fixture
+def berlin_time(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_local_days_follow_dst(tmp_path, berlin_time):
+    # Clocks go back at 03:00 on 2024-10-27 (UTC+2 -> UTC+1)
+    logger = TradeLogger(db_path=str(tmp_path / "trades.db"), log_dir=str(tmp_path / "logs"), sync=True)
+    logger.log_trades([
+        {'timestamp': timestamp, 'symbol': "XAUUSD", 'status': 'WIN', 'profit': 1.0}
+        for timestamp in ("2024-10-26T23:30:00", "2024-10-27T00:30:00", "2024-10-28T00:30:00",
+                          "2024-03-31T01:30:00", "2024-03-31T03:30:00")
+    ])
+    logger.close()
+
+    analytics = TradeAnalytics(str(tmp_path / "trades.db"))
+    metrics = analytics.metrics(1000.0)
+    analytics.close()
+    assert metrics['trading_days'] == 4
+    assert list(np.flatnonzero(metrics['hourly_trades'])) == [0, 1, 3, 23]
+    assert list(metrics['hourly_trades'][[0, 1, 3, 23]]) == [2, 1, 1, 1]
@@ -0,0 +1,54 @@
+"""
+Trade journal rotation: several writers on one log directory (one
+TradeLogger per account, as MultiAccountBot runs them) lose no records
+Run: python -m pytest test_journal.py
+"""
+import os
+
+from journal import TradeJournal, journal_files, read_journal
+from logger import TradeLogger, journal_prefix
+
+
+def test_accounts_get_own_prefix():
+    assert journal_prefix() == "trades"
+    assert journal_prefix("demo") == "trades_demo"
+    assert journal_prefix("live/2") == "trades_live_2"
+
+
+def test_two_writers_rotate_without_loss(tmp_path):
+    log_dir = str(tmp_path / "logs")
+    loggers = [TradeLogger(db_path=str(tmp_path / "trades.db"), log_dir=log_dir, account=name, sync=True)
+               for name in ("alpha", "beta")]
+    for logger in loggers:
+        logger.journal.max_bytes = 20000
+
+    records = 2000
+    for i in range(records):
+        for logger in loggers:
+            logger.log_trade({'symbol': "XAUUSD", 'status': 'OPEN', 'comment': f"#{i}",
+                              'account': logger.account})
+    for logger in loggers:
+        logger.close()
+
+    for name in ("alpha", "beta"):
+        prefix = journal_prefix(name)
+        parts = journal_files(log_dir, prefix)
+        assert len(parts) > 2  # rotated several times
+        assert all(path.endswith('.gz') for path in parts[:-1])
+        rows = list(read_journal(log_dir, prefix))
+        assert [row['comment'] for row in rows] == [f"#{i}" for i in range(records)]
+        assert {row['account'] for row in rows} == {name}
+
+
+def test_reopen_keeps_rotated_parts(tmp_path):
+    log_dir = str(tmp_path)
+    journal = TradeJournal(log_dir, max_bytes=500)
+    journal.write([{'n': i} for i in range(50)])
+    journal.write([{'n': i} for i in range(50, 100)])
+    journal.close()
+
+    journal = TradeJournal(log_dir, max_bytes=500)
+    journal.write([{'n': 100}])
+    journal.close()
+    assert [row['n'] for row in read_journal(log_dir)] == list(range(101))
+    assert not any(name.endswith('.tmp') for name in os.listdir(log_dir))
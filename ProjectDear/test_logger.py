@@ -0,0 +1,68 @@
+"""
+TradeLogger writes: bad rows fail in the caller without taking other
+trades with them, and everything queued is on disk after close()
+Run: python -m pytest test_logger.py
+"""
+import sqlite3
+
+import pytest
+
+from journal import read_journal
+from logger import TradeLogger
+
+
+def trade(i, **fields):
+    return dict({'timestamp': f"2024-01-02T10:{i // 60:02d}:{i % 60:02d}", 'symbol': "XAUUSD",
+                 'status': 'WIN', 'profit': 1.0, 'comment': f"#{i}"}, **fields)
+
+
+def make_logger(tmp_path, **kwargs):
+    return TradeLogger(db_path=str(tmp_path / "trades.db"), log_dir=str(tmp_path / "logs"), **kwargs)
+
+
+def stored_comments(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "trades.db"))
+    rows = [row[0] for row in conn.execute("SELECT comment FROM trades ORDER BY id")]
+    conn.close()
+    return rows
+
+
+def test_bad_row_raises_in_caller(tmp_path):
+    logger = make_logger(tmp_path, sync=True)
+    with pytest.raises(ValueError):
+        logger.log_trade(trade(0, timestamp="bogus"))
+    logger.log_trade(trade(1))
+    with pytest.raises(ValueError):
+        logger.log_trades([trade(2), trade(3, timestamp="bogus")])
+    assert logger.get_day_stats("2024-01-02")['wins'] == 1
+    logger.close()
+    assert stored_comments(tmp_path) == ["#1"]
+    assert [row['comment'] for row in read_journal(str(tmp_path / "logs"))] == ["#1"]
+
+
+def test_failed_batch_keeps_other_items(tmp_path):
+    logger = make_logger(tmp_path, flush_interval=1.0)
+    logger.log_trade(trade(0))
+    logger.update_daily_stats("2024-01-02", {'balance': object()})  # unbindable, fails in the writer
+    logger.log_trade(trade(1))
+    logger.flush()
+    assert logger.get_day_stats("2024-01-02")['trades'] == 2
+    logger.close()
+    assert stored_comments(tmp_path) == ["#0", "#1"]
+
+
+@pytest.mark.parametrize("sync", [True, False])
+def test_close_flushes_everything(tmp_path, sync):
+    logger = make_logger(tmp_path, sync=sync, flush_interval=10.0)
+    for i in range(500):
+        logger.log_trade(trade(i))
+    logger.log_trades([trade(i) for i in range(500, 1000)], file_log=True)
+    logger.update_daily_stats("2024-01-02", {'balance': 1234.5})
+    logger.close()
+
+    assert stored_comments(tmp_path) == [f"#{i}" for i in range(1000)]
+    assert len(list(read_journal(str(tmp_path / "logs")))) == 1000
+    reopened = make_logger(tmp_path, sync=True)
+    assert reopened.get_day_stats("2024-01-02")['trades'] == 1000
+    assert reopened.get_stats(1)[0][1:] == (1000, 1000, 0, 1000.0, 1234.5)
+    reopened.close()
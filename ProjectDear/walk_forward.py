@@ -0,0 +1,225 @@
+"""
+Walk-Forward Module
+Rolling in-sample optimization / out-of-sample evaluation of the
+config['indicators'] and config['strategy'] parameters
+"""
+import copy
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import Backtester
+
+
+def expand_grid(grid):
+    """
+    {'indicators': {'rsi_period': [7, 14]}, 'strategy': {...}}
+    -> list of {'indicators': {...}, 'strategy': {...}} overrides
+    """
+    keys = [(section, name) for section, params in grid.items() for name in params]
+    values = [grid[section][name] for section, name in keys]
+
+    combos = []
+    for choice in itertools.product(*values):
+        combo = {}
+        for (section, name), value in zip(keys, choice):
+            combo.setdefault(section, {})[name] = value
+        combos.append(combo)
+    return combos
+
+
+def apply_params(config, params):
+    """Copy of config with parameter overrides applied"""
+    config = copy.deepcopy(config)
+    for section, values in params.items():
+        config[section].update(values)
+    return config
+
+
+def score(results, metric):
+    """Objective used to pick parameters"""
+    if metric == 'win_rate':
+        return results['wins'] / results['total_trades'] if results['total_trades'] else 0.0
+    if metric == 'profit_factor':
+        won = sum(t['profit'] for t in results['trades'] if t['profit'] > 0)
+        lost = -sum(t['profit'] for t in results['trades'] if t['profit'] <= 0)
+        return won / lost if lost else (float('inf') if won else 0.0)
+    return results['total_profit']
+
+
+def _summary(results):
+    total = results['total_trades']
+    return {
+        'trades': total,
+        'wins': results['wins'],
+        'losses': results['losses'],
+        'win_rate': results['wins'] / total if total else 0.0,
+        'profit': results['total_profit'],
+        'final_balance': results['final_balance'],
+    }
+
+
+def _optimize_window(job):
+    """Worker: grid search in-sample, then run the winner out-of-sample"""
+    config, combos, data, window, warmup, metric = job
+    is_start, is_end, oos_end = window['is_start'], window['is_end'], window['oos_end']
+
+    # Each slice carries `warmup` extra bars in front for the indicators
+    is_from = max(0, is_start - warmup)
+    in_sample = {name: values[is_from:is_end] for name, values in data.items()}
+    is_offset = is_start - is_from
+
+    best_params, best_score, best_results = None, None, None
+    for params in combos:
+        results = Backtester(apply_params(config, params)).run(in_sample, start=is_offset)
+        value = score(results, metric)
+        if best_score is None or value > best_score:
+            best_params, best_score, best_results = params, value, results
+
+    oos_from = max(0, is_end - warmup)
+    out_of_sample = {name: values[oos_from:oos_end] for name, values in data.items()}
+    oos_results = Backtester(apply_params(config, best_params)).run(
+        out_of_sample, start=is_end - oos_from)
+
+    return {
+        **window,
+        'params': best_params,
+        'in_sample': {**_summary(best_results), 'score': best_score},
+        'out_of_sample': {**_summary(oos_results), 'score': score(oos_results, metric)},
+    }
+
+
+class WalkForwardRunner:
+    """
+    Split history into rolling windows and optimize each one in a worker
+    Window k: in-sample [s, s + in_sample_bars), out-of-sample the next
+    out_of_sample_bars; s advances by out_of_sample_bars. Windows are
+    independent, so they are spread over a process pool.
+    """
+
+    def __init__(self, config, grid=None, in_sample_bars=None, out_of_sample_bars=None,
+                 metric=None, workers=None):
+        settings = config.get('walk_forward', {})
+        self.config = config
+        self.grid = grid or settings.get('grid', {})
+        self.in_sample_bars = in_sample_bars or settings.get('in_sample_bars', 20000)
+        self.out_of_sample_bars = out_of_sample_bars or settings.get('out_of_sample_bars', 5000)
+        self.metric = metric or settings.get('metric', 'total_profit')
+        self.workers = workers or settings.get('workers') or os.cpu_count() or 1
+
+        # Enough bars in front of every slice for the longest indicator window
+        periods = [config['indicators'][name] for name in
+                   ('rsi_period', 'bb_period', 'atr_period', 'volume_ma_period')]
+        for name in ('rsi_period', 'bb_period', 'atr_period', 'volume_ma_period'):
+            periods.extend(self.grid.get('indicators', {}).get(name, []))
+        self.warmup = max(periods) + 1
+
+    def windows(self, bars):
+        """In-sample / out-of-sample bar ranges"""
+        windows = []
+        start = 0
+        while start + self.in_sample_bars + self.out_of_sample_bars <= bars:
+            is_end = start + self.in_sample_bars
+            windows.append({
+                'window': len(windows),
+                'is_start': start,
+                'is_end': is_end,
+                'oos_end': is_end + self.out_of_sample_bars,
+            })
+            start += self.out_of_sample_bars
+        return windows
+
+    def run(self, data):
+        """
+        Run walk-forward optimization
+        data: DataFrame, MT5 rates array or HistoryView
+        Returns: report dict with per-window results and OOS totals
+        """
+        names = getattr(getattr(data, 'dtype', None), 'names', None) or list(data.columns)
+        columns = {name: np.asarray(data[name]) for name in
+                   ('time', 'open', 'high', 'low', 'close', 'tick_volume') if name in names}
+
+        combos = expand_grid(self.grid) or [{}]
+        windows = self.windows(len(columns['close']))
+        if not windows:
+            print("⚠️  Not enough bars for one in-sample + out-of-sample window")
+            return None
+
+        print(f"🔁 Walk-forward: {len(windows)} windows x {len(combos)} combos "
+              f"on {self.workers} workers")
+
+        jobs = []
+        for window in windows:
+            # Ship only the bars this window needs
+            lo = max(0, window['is_start'] - self.warmup)
+            hi = window['oos_end']
+            sliced = {name: values[lo:hi] for name, values in columns.items()}
+            local = {key: value - lo if key != 'window' else value for key, value in window.items()}
+            jobs.append((self.config, combos, sliced, local, self.warmup, self.metric))
+
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_optimize_window, jobs))
+        else:
+            results = [_optimize_window(job) for job in jobs]
+
+        # Report ranges in absolute bars / times
+        times = columns['time']
+        for window, result in zip(windows, results):
+            result.update(window)
+            result['is_from_time'] = str(times[window['is_start']])
+            result['oos_from_time'] = str(times[window['is_end']])
+            result['oos_to_time'] = str(times[window['oos_end'] - 1])
+
+        oos = [r['out_of_sample'] for r in results]
+        total_trades = sum(r['trades'] for r in oos)
+        total_wins = sum(r['wins'] for r in oos)
+        return {
+            'metric': self.metric,
+            'in_sample_bars': self.in_sample_bars,
+            'out_of_sample_bars': self.out_of_sample_bars,
+            'combos': len(combos),
+            'windows': results,
+            'oos_trades': total_trades,
+            'oos_win_rate': total_wins / total_trades if total_trades else 0.0,
+            'oos_profit': sum(r['profit'] for r in oos),
+        }
+
+
+def print_report(report):
+    """Print per-window walk-forward results"""
+    print("\n" + "="*50)
+    print("🔁 WALK-FORWARD REPORT")
+    print("="*50)
+    for w in report['windows']:
+        is_stats, oos_stats = w['in_sample'], w['out_of_sample']
+        print(f"#{w['window']} OOS {w['oos_from_time']} -> {w['oos_to_time']}")
+        print(f"   Params: {w['params']}")
+        print(f"   IS:  {is_stats['trades']} trades | win {is_stats['win_rate']*100:.1f}% | P/L ${is_stats['profit']:.2f}")
+        print(f"   OOS: {oos_stats['trades']} trades | win {oos_stats['win_rate']*100:.1f}% | P/L ${oos_stats['profit']:.2f}")
+    print("-"*50)
+    print(f"OOS trades: {report['oos_trades']} | Win rate: {report['oos_win_rate']*100:.1f}%")
+    print(f"OOS total P/L: ${report['oos_profit']:.2f}")
+    print("="*50 + "\n")
+
+
+if __name__ == "__main__":
+    # Usage: python walk_forward.py history.csv [report.json]
+    if len(sys.argv) < 2:
+        print("Usage: python walk_forward.py <ohlcv.csv> [report.json]")
+        sys.exit(1)
+
+    with open("config.json", 'r') as f:
+        config = json.load(f)
+
+    report = WalkForwardRunner(config).run(pd.read_csv(sys.argv[1]))
+    if report:
+        print_report(report)
+        if len(sys.argv) > 2:
+            with open(sys.argv[2], 'w') as f:
+                json.dump(report, f, indent=2, default=str)